@@ -1,15 +1,11 @@
-from flask import render_template
+import os
+
 from project import create_app
 
+# "/" is served by the main blueprint (views.home); this module only starts
+# the development server. Production runs `gunicorn -c gunicorn.conf.py wsgi:app`.
 app = create_app()
 app.config['PROPAGATE_EXCEPTIONS'] = True
 
-
-@app.route('/', methods=['GET'])
-def Home():
-    print(">>> HOME ROUTE REACHED <<<")
-    return render_template('index.html')
-
 if __name__ == '__main__':
-    app.run(debug=True)
-
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1")
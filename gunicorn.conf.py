@@ -0,0 +1,70 @@
+"""Gunicorn settings for ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Every value can be overridden from the environment:
+
+    WEB_CONCURRENCY          worker processes (2 * CPUs + 1, capped at 8)
+    GUNICORN_THREADS         request threads per worker (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    AVAILABILITY_MAX_STREAMS extra threads per worker for SSE streams (8)
+    GUNICORN_BIND            listen address (0.0.0.0:8000)
+    GUNICORN_MAX_REQUESTS    recycle a worker after this many requests (2000)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds to finish in-flight requests on shutdown (30)
+    GUNICORN_WORKER_WARMUP   DB connections each worker opens when it starts (2)
+
+Request threads are sized to the pool so each worker can run as many
+requests as it has connections. SSE availability streams give their
+connection back before they park but hold a thread for up to 30 minutes, so
+they get their own AVAILABILITY_MAX_STREAMS threads on top; the app answers
+503 past that cap and the page falls back to polling. Keep
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below MySQL's max_connections.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault("APP_ENV", "production")
+# The app is preloaded in the master; connections are opened per worker instead.
+os.environ["DB_POOL_WARMUP"] = "0"
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+threads = int(os.getenv(
+    "GUNICORN_THREADS",
+    int(os.getenv("DB_POOL_SIZE", "10")) + int(os.getenv("DB_MAX_OVERFLOW", "10")),
+)) + int(os.getenv("AVAILABILITY_MAX_STREAMS", "8"))
+
+# Import the app once in the master so workers fork with it already built.
+preload_app = True
+
+# Recycle workers to bound memory growth; jitter keeps them from all
+# restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+# SIGTERM: stop accepting, let in-flight requests finish, then exit.
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = 60
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """Give each worker its own DB and SQLite connections, then warm its pool."""
+    import wsgi
+    from project import admission, db_pool, idempotency
+
+    db_pool.dispose_after_fork(wsgi.app)
+    admission.admission_gate.reset_connections()
+    idempotency.idempotency_store.reset_connections()
+    db_pool.warm_pool(wsgi.app, int(os.getenv("GUNICORN_WORKER_WARMUP", "2")))
+
+
+def worker_exit(server, worker):
+    """Close this worker's pooled connections instead of leaving them to time out."""
+    import wsgi
+    from project import db
+
+    with wsgi.app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
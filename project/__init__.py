@@ -4,14 +4,30 @@ from flask_login import LoginManager, current_user
 import logging      
 import os
 from dotenv import load_dotenv
+from jinja2 import FileSystemBytecodeCache
 
 db=SQLAlchemy()
 login_manager=LoginManager()
 
-def create_app():
+def create_app(config=None):
+    """Build the app; ``config`` overrides settings before any extension starts.
+
+    APP_ENV=production takes settings from the real environment only (no .env)
+    and never runs ``db.create_all()``: the schema comes from ``flask schema
+    upgrade``. Phase timings are logged (see startup.py).
+    """
+    from .startup import StartupTimer
+    timer = StartupTimer()
     app=Flask(__name__)
 
-    load_dotenv()
+    production = os.getenv("APP_ENV", "development") == "production"
+    if not production:
+        load_dotenv()
+    timer.mark("dotenv")
+
+    app.config['APP_ENV'] = "production" if production else "development"
+    # create_all() probes every table on each boot; development convenience only
+    app.config['DB_CREATE_ALL'] = os.getenv("DB_CREATE_ALL", "0" if production else "1") == "1"
 
     app.config['SECRET_KEY'] = os.getenv("SECRET_KEY", "dev-only-change-me")
 
@@ -20,32 +36,149 @@ def create_app():
     app.config['MYSQL_PASSWORD'] = os.getenv("MYSQL_PASSWORD")
     app.config['MYSQL_DB'] = os.getenv("MYSQL_DB")
 
-    app.config['SQLALCHEMY_DATABASE_URI'] = (
+    # DATABASE_URL / REPLICA_DATABASE_URL override the MySQL settings (e.g. two
+    # SQLite files standing in for primary and replica when testing locally).
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL") or (
         f"mysql+pymysql://{app.config['MYSQL_USER']}:{app.config['MYSQL_PASSWORD']}"
         f"@{app.config['MYSQL_HOST']}/{app.config['MYSQL_DB']}"
     )
-    
+
+    # Optional read replica for the read-only listing routes (see db_routing.py)
+    replica_url = os.getenv("REPLICA_DATABASE_URL")
+    if not replica_url and os.getenv("MYSQL_REPLICA_HOST"):
+        replica_url = (
+            f"mysql+pymysql://{os.getenv('MYSQL_REPLICA_USER', app.config['MYSQL_USER'])}"
+            f":{os.getenv('MYSQL_REPLICA_PASSWORD', app.config['MYSQL_PASSWORD'])}"
+            f"@{os.getenv('MYSQL_REPLICA_HOST')}/{os.getenv('MYSQL_REPLICA_DB', app.config['MYSQL_DB'])}"
+        )
+    if replica_url:
+        app.config['SQLALCHEMY_BINDS'] = {
+            "replica": {"url": replica_url, "pool_logging_name": "replica"},
+        }
+    # Seconds a user's reads stay on the primary after they book/cancel/reschedule
+    app.config['REPLICA_STICKY_SECONDS'] = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Pool size / overflow / recycle / pre-ping come from DB_POOL_* env vars
+    from .db_pool import engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+
+    # Confirmation-code allocator: permutation key (never change once codes are
+    # issued) and how many sequence numbers a worker reserves at a time. The key
+    # is its own setting, not SECRET_KEY: rotating the session secret must not
+    # re-key the permutation. Production refuses to start without it.
+    app.config['CONFIRMATION_CODE_KEY'] = os.getenv(
+        "CONFIRMATION_CODE_KEY", None if production else "dev-only-confirmation-key")
+    app.config['CONFIRMATION_CODE_BLOCK'] = int(os.getenv("CONFIRMATION_CODE_BLOCK", "50"))
+
+    # Seconds a cached /api/exams/availability body may be reused
+    app.config['AVAILABILITY_CACHE_TTL'] = float(os.getenv("AVAILABILITY_CACHE_TTL", "10"))
+    # Open availability SSE streams per worker (each parks a thread; see gunicorn.conf.py)
+    app.config['AVAILABILITY_MAX_STREAMS'] = int(os.getenv("AVAILABILITY_MAX_STREAMS", "8"))
+
+    # Booking transactions retry deadlocks / lock-wait timeouts within this budget
+    app.config['TXN_RETRY_ATTEMPTS'] = int(os.getenv("TXN_RETRY_ATTEMPTS", "4"))
+    app.config['TXN_RETRY_BASE_MS'] = float(os.getenv("TXN_RETRY_BASE_MS", "20"))
+    app.config['TXN_RETRY_MAX_MS'] = float(os.getenv("TXN_RETRY_MAX_MS", "400"))
+    app.config['TXN_RETRY_BUDGET_MS'] = float(os.getenv("TXN_RETRY_BUDGET_MS", "1500"))
+
+    # Seat holds taken on the review page: lifetime, and the background sweeper
+    # that releases expired ones (interval, exams per batch, on/off per worker)
+    app.config['SEAT_HOLD_SECONDS'] = int(os.getenv("SEAT_HOLD_SECONDS", "300"))
+    app.config['SEAT_HOLD_SWEEP_SECONDS'] = float(os.getenv("SEAT_HOLD_SWEEP_SECONDS", "30"))
+    app.config['SEAT_HOLD_SWEEP_BATCH'] = int(os.getenv("SEAT_HOLD_SWEEP_BATCH", "100"))
+    app.config['SEAT_HOLD_SWEEPER'] = os.getenv("SEAT_HOLD_SWEEPER", "1") == "1"
+
+    # Waiting room in front of the booking routes (see admission.py). Limits are
+    # per host: every worker shares the SQLite ticket store.
+    app.config['ADMISSION_CONTROL'] = os.getenv("ADMISSION_CONTROL", "1") == "1"
+    app.config['ADMISSION_STORE'] = os.getenv("ADMISSION_STORE")
+    app.config['ADMISSION_GLOBAL_LIMIT'] = int(os.getenv("ADMISSION_GLOBAL_LIMIT", "24"))
+    app.config['ADMISSION_EXAM_LIMIT'] = int(os.getenv("ADMISSION_EXAM_LIMIT", "4"))
+    app.config['ADMISSION_MAX_WAIT_MS'] = float(os.getenv("ADMISSION_MAX_WAIT_MS", "3000"))
+    app.config['ADMISSION_LEASE_SECONDS'] = float(os.getenv("ADMISSION_LEASE_SECONDS", "30"))
+    app.config['ADMISSION_POLL_MS'] = float(os.getenv("ADMISSION_POLL_MS", "25"))
+
+    # Idempotency-Key replay window and store bound for the JSON booking API
+    app.config['IDEMPOTENCY'] = os.getenv("IDEMPOTENCY", "1") == "1"
+    app.config['IDEMPOTENCY_STORE'] = os.getenv("IDEMPOTENCY_STORE")
+    app.config['IDEMPOTENCY_WINDOW_SECONDS'] = float(os.getenv("IDEMPOTENCY_WINDOW_SECONDS", "3600"))
+    app.config['IDEMPOTENCY_MAX_KEYS'] = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "50000"))
+
+    # Per-worker cache of the logged-in user's identity (user_loader)
+    app.config['IDENTITY_CACHE_TTL'] = float(os.getenv("IDENTITY_CACHE_TTL", "60"))
+    app.config['IDENTITY_CACHE_SIZE'] = int(os.getenv("IDENTITY_CACHE_SIZE", "5000"))
+
+    # Reference-data cache: how often to check the version row, and max age
+    app.config['REFDATA_CHECK_SECONDS'] = float(os.getenv("REFDATA_CHECK_SECONDS", "30"))
+    app.config['REFDATA_TTL'] = float(os.getenv("REFDATA_TTL", "3600"))
+
+    # Compiled templates are cached on disk and shared by every worker;
+    # rendered /student/exams rows are cached per exam (fragment_cache.py)
+    app.config['TEMPLATE_CACHE_DIR'] = os.getenv("TEMPLATE_CACHE_DIR") or os.path.join(
+        app.instance_path, "jinja_cache")
+    app.config['FRAGMENT_CACHE_SIZE'] = int(os.getenv("FRAGMENT_CACHE_SIZE", "5000"))
+
+    # Manifest written by tools/build_assets.py (default: static/dist/manifest.json)
+    app.config['STATIC_MANIFEST'] = os.getenv("STATIC_MANIFEST")
+
+    # gzip/brotli for HTML/JSON/CSV responses of at least COMPRESSION_MIN_SIZE bytes
+    app.config['COMPRESSION'] = os.getenv("COMPRESSION", "1") == "1"
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    app.config['COMPRESSION_LEVEL'] = int(os.getenv("COMPRESSION_LEVEL", "6"))
+    app.config['COMPRESSION_BR_QUALITY'] = int(os.getenv("COMPRESSION_BR_QUALITY", "4"))
+
+    # /__metrics (loopback clients and faculty only); off by default in production
+    app.config['METRICS_ENDPOINT'] = os.getenv("METRICS_ENDPOINT", "0" if production else "1") == "1"
+
+    # Opt-in per-request SQL profiling (statement counts, DB time, slow statements)
+    app.config['SQL_PROFILING'] = os.getenv("SQL_PROFILING", "0") == "1"
+    app.config['SQL_PROFILE_SLOW_MS'] = float(os.getenv("SQL_PROFILE_SLOW_MS", "100"))
+    app.config['SQL_PROFILE_REQUEST_MS'] = float(os.getenv("SQL_PROFILE_REQUEST_MS", "250"))
+    app.config['SQL_PROFILE_MAX_STATEMENTS'] = int(os.getenv("SQL_PROFILE_MAX_STATEMENTS", "15"))
+    app.config['SQL_PROFILE_TOP'] = int(os.getenv("SQL_PROFILE_TOP", "5"))
+
+    if config:
+        app.config.update(config)
+    if not app.config['CONFIRMATION_CODE_KEY']:
+        raise RuntimeError("CONFIRMATION_CODE_KEY must be set in production "
+                           "(a stable value, independent of SECRET_KEY)")
+    timer.mark("config")
+
     # Init extensions
     db.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
     login_manager.session_protection = "strong"
-    from .models import User
+
+    os.makedirs(app.config['TEMPLATE_CACHE_DIR'], exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])
+
+    from . import (admission, assets, compression, db_pool, fragment_cache, idempotency,
+                   identity_cache, profiler, seat_holds)
+    admission.init_app(app)
+    assets.init_app(app)
+    compression.init_app(app)
+    fragment_cache.init_app(app)
+    idempotency.init_app(app)
+    identity_cache.init_app(app)
+    db_pool.init_app(app)
+    profiler.init_app(app)
+    seat_holds.init_app(app)
 
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        # cached snapshot (one joined query on a miss); see identity_cache.py
+        return identity_cache.identity_cache.get(int(user_id))
+    timer.mark("extensions")
 
-    
-
-    # Import models so create_all sees them (add your models here)
-    with app.app_context():
-        # from .exams import Exam  # if you have this model
-        # from .models import User # when you add it
-        db.create_all()
+    # Models are imported by identity_cache.init_app, so create_all sees them
+    if app.config['DB_CREATE_ALL']:
+        with app.app_context():
+            db.create_all()
+    timer.mark("schema")
 
     # Register blueprints here
 
@@ -63,5 +196,24 @@ def create_app():
 
     from .student_exam_routes import student_exam_bp
     app.register_blueprint(student_exam_bp)
+    timer.mark("blueprints")
+
+    from .seat_counter import reconcile_seats_command
+    app.cli.add_command(reconcile_seats_command)
+
+    from .seat_holds import sweep_holds_command
+    app.cli.add_command(sweep_holds_command)
+
+    from .reference_data import bump_refdata_command
+    app.cli.add_command(bump_refdata_command)
+
+    from .migrate import schema_cli
+    app.cli.add_command(schema_cli)
+    timer.mark("cli")
+
+    # Open a few pooled connections now rather than on the first requests
+    db_pool.warm_pool(app, app.config.get('DB_POOL_WARMUP'))
+    timer.mark("warmup")
 
+    timer.finish(app)
     return app
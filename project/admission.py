@@ -0,0 +1,250 @@
+# project/admission.py
+"""Admission control (waiting room) in front of the booking routes.
+
+When a popular window opens, every student hits the listing and booking
+routes at once and the primary saturates on ``FOR UPDATE`` contention. Each
+gated request takes a ticket in a small SQLite store that every worker on the
+host shares (``ADMISSION_STORE``, default ``<instance>/admission.sqlite3``):
+
+* at most ``ADMISSION_GLOBAL_LIMIT`` gated requests run at once per host, and
+  at most ``ADMISSION_EXAM_LIMIT`` per exam;
+* tickets for the same exam are admitted first come, first served;
+* a request that is not admitted within ``ADMISSION_MAX_WAIT_MS`` gives its
+  ticket up and is answered 503 with its queue position and a Retry-After
+  hint instead of piling onto the database.
+
+Tickets are leases (``ADMISSION_LEASE_SECONDS``), so a worker that dies
+mid-request can't hold a slot forever.
+"""
+import functools
+import math
+import os
+import sqlite3
+import time
+
+from flask import current_app, flash, jsonify, redirect, render_template, request, url_for
+
+from . import metrics
+from .sqlite_store import SQLiteStore
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tickets (
+        id       INTEGER PRIMARY KEY AUTOINCREMENT,
+        exam_id  INTEGER,
+        state    TEXT NOT NULL,
+        expires  REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_tickets_exam_state ON tickets (exam_id, state, id);
+    CREATE INDEX IF NOT EXISTS idx_tickets_state ON tickets (state, expires);
+"""
+
+
+class Rejected(Exception):
+    """Not admitted in time; carries the queue position and a retry hint."""
+
+    def __init__(self, position, retry_after):
+        super().__init__(f"queued at position {position}")
+        self.position = position
+        self.retry_after = retry_after
+
+
+class AdmissionGate(SQLiteStore):
+    def __init__(self):
+        super().__init__()
+        self._cfg = {}
+
+    def configure(self, path, global_limit, exam_limit, max_wait_ms, lease_seconds, poll_ms):
+        self._cfg = {
+            "global_limit": global_limit,
+            "exam_limit": exam_limit,
+            "max_wait": max_wait_ms / 1000,
+            "lease": lease_seconds,
+            "poll": poll_ms / 1000,
+        }
+        self._open(path, _SCHEMA)
+
+    def _enqueue(self, exam_id):
+        def enqueue(conn):
+            now = time.time()
+            conn.execute("DELETE FROM tickets WHERE expires < ?", (now,))
+            return conn.execute(
+                "INSERT INTO tickets (exam_id, state, expires) VALUES (?, 'waiting', ?)",
+                (exam_id, now + self._cfg["lease"]),
+            ).lastrowid
+        return self._write(enqueue)
+
+    def _try_admit(self, ticket, exam_id):
+        """Admit ``ticket`` if both limits have room and no one is ahead of it.
+
+        Returns 0 when admitted, else the ticket's 1-based queue position.
+        Waiting is a plain read (WAL readers never block on the writer); the
+        write lock is taken only to claim a slot, re-checking under it.
+        """
+        cfg = self._cfg
+
+        def position(conn):
+            ahead = conn.execute(
+                "SELECT COUNT(*) FROM tickets WHERE state = 'waiting' AND id < ?"
+                " AND exam_id IS ?", (ticket, exam_id),
+            ).fetchone()[0]
+            if ahead:
+                return ahead + 1
+            running = conn.execute(
+                "SELECT COUNT(*), IFNULL(SUM(exam_id IS ?), 0) FROM tickets"
+                " WHERE state = 'active'", (exam_id,),
+            ).fetchone()
+            room = running[0] < cfg["global_limit"] and (
+                exam_id is None or running[1] < cfg["exam_limit"])
+            return 0 if room else 1
+
+        queued = position(self._conn())
+        if queued:
+            return queued
+
+        def admit(conn):
+            queued = position(conn)
+            if not queued:
+                conn.execute(
+                    "UPDATE tickets SET state = 'active', expires = ? WHERE id = ?",
+                    (time.time() + cfg["lease"], ticket),
+                )
+            return queued
+        return self._write(admit)
+
+    def _release(self, ticket):
+        try:
+            self._write(lambda conn: conn.execute("DELETE FROM tickets WHERE id = ?", (ticket,)))
+        except sqlite3.OperationalError:
+            # store still locked after the timeout; the lease runs out on its own
+            metrics.incr("admission.store_busy")
+
+    def _rejected(self, exam_id, position):
+        cfg = self._cfg
+        metrics.incr("admission.rejected")
+        metrics.observe("admission.rejected_position", position,
+                        "global" if exam_id is None else "exam")
+        # roughly one wait window per exam-limit's worth of people ahead
+        per_window = cfg["exam_limit"] if exam_id is not None else cfg["global_limit"]
+        retry_after = max(1, math.ceil(cfg["max_wait"] * position / max(per_window, 1)))
+        return Rejected(position, retry_after)
+
+    def acquire(self, exam_id=None):
+        """Block until admitted; returns the ticket, or raises ``Rejected``.
+
+        A store still locked after SQLite's busy timeout counts as not
+        admitted, so the caller answers 503 + Retry-After rather than 500.
+        """
+        cfg = self._cfg
+        started = time.monotonic()
+        try:
+            ticket = self._enqueue(exam_id)
+        except sqlite3.OperationalError:
+            metrics.incr("admission.store_busy")
+            raise self._rejected(exam_id, 1)
+        position = 1
+        try:
+            while True:
+                try:
+                    position = self._try_admit(ticket, exam_id)
+                except sqlite3.OperationalError:
+                    metrics.incr("admission.store_busy")
+                    break
+                waited = time.monotonic() - started
+                if not position:
+                    metrics.observe("admission.wait_ms", waited * 1000,
+                                    "global" if exam_id is None else "exam")
+                    metrics.incr("admission.admitted")
+                    if waited >= cfg["poll"]:
+                        metrics.incr("admission.queued")
+                    return ticket
+                if waited + cfg["poll"] > cfg["max_wait"]:
+                    break
+                time.sleep(cfg["poll"])
+        except BaseException:
+            self._release(ticket)
+            raise
+
+        self._release(ticket)
+        raise self._rejected(exam_id, position)
+
+    def release(self, ticket):
+        self._release(ticket)
+
+    def depth(self) -> dict:
+        rows = self._conn().execute(
+            "SELECT state, COUNT(*) FROM tickets WHERE expires >= ? GROUP BY state",
+            (time.time(),),
+        ).fetchall()
+        counts = dict(rows)
+        return {"waiting": counts.get("waiting", 0), "active": counts.get("active", 0)}
+
+
+admission_gate = AdmissionGate()
+
+
+def _rejected_response(rejection, exam_id):
+    msg = (f"Registration is very busy right now. You are number {rejection.position} "
+           f"in line; please try again in {rejection.retry_after} seconds.")
+    if request.is_json:
+        resp = jsonify({"ok": False, "error": msg, "queued": True,
+                        "position": rejection.position, "retry_after": rejection.retry_after})
+        resp.status_code = 503
+    elif request.method == "GET":
+        resp = current_app.make_response((render_template(
+            "waiting_room.html", position=rejection.position,
+            retry_after=rejection.retry_after), 503))
+    else:
+        # a form post can't be replayed by a refresh; send them back to the
+        # review page (their seat hold is still good) or their appointments
+        flash(msg, "error")
+        target = (url_for("student_ui.register_review", exam_id=exam_id)
+                  if request.endpoint == "student_ui.register_exam" and exam_id
+                  else url_for("student_ui.student_appointments"))
+        resp = redirect(target)
+    resp.headers["Retry-After"] = str(rejection.retry_after)
+    return resp
+
+
+def admission_controlled(exam_id_of=None):
+    """Gate a view; ``exam_id_of(view_kwargs)`` picks the per-exam queue (or None)."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config["ADMISSION_CONTROL"]:
+                return view(*args, **kwargs)
+            exam_id = None
+            if exam_id_of is not None:
+                try:
+                    exam_id = int(exam_id_of(kwargs))
+                except (TypeError, ValueError):
+                    exam_id = None
+            try:
+                ticket = admission_gate.acquire(exam_id)
+            except Rejected as rejection:
+                return _rejected_response(rejection, exam_id)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                admission_gate.release(ticket)
+        return wrapper
+    return decorator
+
+
+def exam_id_from_payload(kwargs):
+    payload = request.get_json(silent=True) if request.is_json else request.form
+    return (payload or {}).get("exam_id")
+
+
+def init_app(app):
+    if not app.config["ADMISSION_CONTROL"]:
+        return
+    path = app.config["ADMISSION_STORE"] or os.path.join(app.instance_path, "admission.sqlite3")
+    admission_gate.configure(
+        path,
+        global_limit=app.config["ADMISSION_GLOBAL_LIMIT"],
+        exam_limit=app.config["ADMISSION_EXAM_LIMIT"],
+        max_wait_ms=app.config["ADMISSION_MAX_WAIT_MS"],
+        lease_seconds=app.config["ADMISSION_LEASE_SECONDS"],
+        poll_ms=app.config["ADMISSION_POLL_MS"],
+    )
+    metrics.register_gauge("admission.queue", admission_gate.depth)
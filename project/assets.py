@@ -0,0 +1,97 @@
+# project/assets.py
+"""Serve the fingerprinted assets built by ``tools/build_assets.py``.
+
+When ``static/dist/manifest.json`` exists, ``url_for('static',
+filename='css/style.css')`` resolves to the hashed copy under ``dist/``, so
+templates need no changes. Hashed files never change, so they are served with
+``Cache-Control: public, max-age=<1 year>, immutable``, and with a precompressed
+``.br`` / ``.gz`` body when the client accepts it. ``webp_url()`` (a template
+global) gives the resized WebP copy of an image, or None.
+
+Without a manifest (a fresh checkout, no build step) everything falls back to
+the plain files and Flask's default caching.
+"""
+import json
+import logging
+import mimetypes
+import os
+
+from flask import request, send_from_directory, url_for
+
+log = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# preference order when the client accepts several
+_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+class AssetManifest:
+    def __init__(self):
+        self.files = {}
+        self.encodings = {}
+        self.webp = {}
+
+    def load(self, path) -> bool:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        self.files = data.get("files", {})
+        self.encodings = data.get("encodings", {})
+        self.webp = data.get("webp", {})
+        return True
+
+    def resolve(self, filename):
+        return self.files.get(filename, filename)
+
+
+asset_manifest = AssetManifest()
+
+
+def _send_built(static_folder, filename):
+    """A ``dist/`` file, precompressed when possible, cached forever."""
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = suffix = None
+    for candidate, ext in _SUFFIXES:
+        if candidate in asset_manifest.encodings.get(filename, ()) and \
+                request.accept_encodings.quality(candidate) > 0:
+            encoding, suffix = candidate, ext
+            break
+
+    resp = send_from_directory(static_folder, filename + (suffix or ""), mimetype=mimetype)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if filename in asset_manifest.encodings:
+        resp.vary.add("Accept-Encoding")
+    resp.headers["Cache-Control"] = IMMUTABLE
+    return resp
+
+
+def init_app(app):
+    path = app.config["STATIC_MANIFEST"] or os.path.join(app.static_folder, "dist", "manifest.json")
+    if not asset_manifest.load(path):
+        log.info("No static asset manifest at %s; serving unfingerprinted files", path)
+        app.jinja_env.globals["webp_url"] = lambda filename: None
+        return
+
+    @app.url_defaults
+    def _fingerprinted_static(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = asset_manifest.resolve(values["filename"])
+
+    plain_static = app.view_functions["static"]
+
+    def static(filename):
+        if filename.startswith("dist/"):
+            return _send_built(app.static_folder, filename)
+        return plain_static(filename=filename)
+
+    app.view_functions["static"] = static
+
+    def webp_url(filename):
+        built = asset_manifest.webp.get(filename)
+        return url_for("static", filename=built) if built else None
+
+    app.jinja_env.globals["webp_url"] = webp_url
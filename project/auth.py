@@ -5,7 +5,8 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import re
 
 from . import db
-from .models import User, Role, Department, Major  # adjust if your models are in a different file
+from .models import User  # adjust if your models are in a different file
+from .reference_data import ref_data
 
 auth = Blueprint('auth', __name__)
 
@@ -24,13 +25,15 @@ def _clean(s: str) -> str:
 def signup():
     roles = ['Student', 'Faculty']
 
+    # Roles / departments / majors come from the per-worker reference cache
+    refs = ref_data()
+    departments = refs.departments
+
     # ---------- GET ----------
     if request.method == 'GET':
-        departments = Department.query.all()
         return render_template('signup.html', roles=roles, departments=departments)
 
     # ---------- POST ----------
-    departments = Department.query.all()  # always available on POST too
 
     role_raw   = _clean(request.form.get('role'))
     role_lower = role_raw.lower()
@@ -99,7 +102,7 @@ def signup():
                                errorMsg='This NSHE is already registered.')
 
         # --- FK resolution (role / major / department) ---
-    role = Role.query.filter_by(name=role_lower.title()).first()
+    role = refs.roles.by_name(role_lower)
     if not role:
         return render_template('signup.html', roles=roles, departments=departments,
                                errorMsg='Role not configured; contact admin.')
@@ -109,13 +112,13 @@ def signup():
 
     if role_lower == 'student':
         # Resolve Major by name from the form; (optional) switch to ID if your form sends major_id
-        major = Major.query.filter_by(name=major_name).first()
+        major = refs.majors.by_name(major_name)
         if not major:
             return render_template('signup.html', roles=roles, departments=departments,
                                    errorMsg='Selected major not found.')
 
         # Auto-fill department from the Major (Option A)
-        dept = Department.query.get(major.department_id)
+        dept = refs.departments.get(major.department_id)
         if not dept:
             return render_template('signup.html', roles=roles, departments=departments,
                                    errorMsg='Major maps to an unknown department. Contact admin.')
@@ -124,7 +127,7 @@ def signup():
         if not department_id:
             return render_template('signup.html', roles=roles, departments=departments,
                                    errorMsg='Department is required for faculty.')
-        dept = Department.query.get(department_id)
+        dept = refs.departments.get(department_id)
         if not dept:
             return render_template('signup.html', roles=roles, departments=departments,
                                    errorMsg='Selected department not found.')
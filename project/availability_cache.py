@@ -0,0 +1,38 @@
+# project/availability_cache.py
+"""Cached JSON body for ``/api/exams/availability``.
+
+An entry is valid while the availability hub version it was built at is
+still current (no local booking has committed since) and its TTL has not
+run out; the TTL bounds how long a commit made by another worker can go
+unseen. The ETag is a digest of the body, so every worker hands out the
+same validator for the same answer.
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+CacheEntry = namedtuple("CacheEntry", "version expires_at body etag")
+
+
+class AvailabilityCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = None
+
+    def get(self, version):
+        with self._lock:
+            entry = self._entry
+        if entry and entry.version == version and time.monotonic() < entry.expires_at:
+            return entry
+        return None
+
+    def put(self, version, body, ttl):
+        etag = hashlib.sha1(body.encode("utf-8")).hexdigest()[:20]
+        entry = CacheEntry(version, time.monotonic() + ttl, body, etag)
+        with self._lock:
+            self._entry = entry
+        return entry
+
+
+availability_cache = AvailabilityCache()
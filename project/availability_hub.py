@@ -0,0 +1,107 @@
+# project/availability_hub.py
+"""In-process fan-out of seat availability changes.
+
+The booking routes publish ``{exam_id: remaining}`` after they commit and
+every open ``/api/exams/availability/stream`` connection receives just those
+deltas. Nothing here touches the database, so an idle tab costs one parked
+thread and no queries; the route caps how many threads that may be.
+
+The hub lives in the worker process: with several workers a tab only hears
+about bookings committed by the worker serving its stream, so the page keeps
+a slow conditional poll of ``/api/exams/availability`` running alongside it.
+"""
+import threading
+import uuid
+
+
+class Subscription:
+    """Pending deltas for a single stream, coalesced per exam."""
+
+    def __init__(self, hub):
+        self._hub = hub
+        self._cond = threading.Condition()
+        self._pending = {}
+        self.last_seq = 0
+
+    def push(self, seq, changes):
+        with self._cond:
+            self._pending.update(changes)
+            self.last_seq = max(self.last_seq, seq)
+            self._cond.notify()
+
+    def wait(self, timeout):
+        """Block until something changed (or timeout); returns the deltas."""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            changes, self._pending = self._pending, {}
+            return changes
+
+    def close(self):
+        self._hub._unsubscribe(self)
+
+
+class AvailabilityHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        # Last value published per exam, so a reconnecting client that sends
+        # Last-Event-ID can be caught up without querying MySQL.
+        self._latest = {}
+        self._seq = 0
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def event_id(self, seq):
+        return f"{self.epoch}:{seq}"
+
+    def subscribe(self, last_event_id=None, limit=None):
+        """A new Subscription, or None when ``limit`` streams are already open."""
+        sub = Subscription(self)
+        with self._lock:
+            if limit is not None and len(self._subscribers) >= limit:
+                return None
+            missed = self._missed_since(last_event_id)
+            if missed:
+                sub.push(self._seq, missed)
+            else:
+                sub.last_seq = self._seq
+            self._subscribers.add(sub)
+        return sub
+
+    def _missed_since(self, last_event_id):
+        if not last_event_id:
+            return {}
+        epoch, _, seq = last_event_id.partition(":")
+        since = int(seq) if epoch == self.epoch and seq.isdigit() else 0
+        return {eid: left for eid, (s, left) in self._latest.items() if s > since}
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, changes):
+        """Fan ``{exam_id: remaining}`` out to every connected stream."""
+        if not changes:
+            return
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            for exam_id, left in changes.items():
+                self._latest[int(exam_id)] = (seq, int(left))
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.push(seq, changes)
+
+    @property
+    def version(self):
+        """Bumped on every publish, i.e. whenever a booking commits here."""
+        with self._lock:
+            return self._seq
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+availability_hub = AvailabilityHub()
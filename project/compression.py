@@ -0,0 +1,128 @@
+# project/compression.py
+"""Negotiated gzip / brotli compression for HTML, JSON and CSV responses.
+
+An ``after_request`` hook compresses a buffered response when the client
+accepts it, its type is in ``COMPRESSIBLE`` and its body is at least
+``COMPRESSION_MIN_SIZE`` bytes. Brotli is preferred when the optional
+``brotli`` package is installed. Levels come from ``COMPRESSION_LEVEL``
+(gzip) and ``COMPRESSION_BR_QUALITY``.
+
+Streamed responses of those types (the print-log exports) are gzipped chunk
+by chunk as they are produced; the SSE feed (text/event-stream) and bodies
+that already carry a Content-Encoding (precompressed static assets) are left
+alone. An ETag becomes weak, since the bytes differ from the identity
+encoding. Sizes before and after go to the ``compression.*`` metrics and to
+the DEBUG log.
+"""
+import gzip
+import logging
+import time
+import zlib
+
+from flask import request
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+log = logging.getLogger(__name__)
+
+COMPRESSIBLE = {"text/html", "application/json", "text/csv", "text/plain", "text/css",
+                "application/javascript", "text/javascript"}
+
+
+def compress(body: bytes, encoding: str, level: int, br_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=br_quality)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def gzip_stream(chunks, level: int, endpoint: str):
+    """Gzip an iterable of str/bytes chunks lazily, one output piece per input chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    size_in = size_out = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            size_in += len(chunk)
+            out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            size_out += len(out)
+            if out:
+                yield out
+        tail = compressor.flush()
+        size_out += len(tail)
+        yield tail
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+    metrics.incr("compression.bytes_in", size_in)
+    metrics.incr("compression.bytes_out", size_out)
+    if size_in:
+        metrics.observe("compression.ratio_pct", 100 * size_out / size_in, endpoint)
+    log.debug("streamed %s: %d -> %d bytes (gzip)", endpoint, size_in, size_out)
+
+
+def choose_encoding(accept_encodings):
+    """The best encoding the client accepts, or None."""
+    if brotli is not None and accept_encodings.quality("br") > 0:
+        return "br"
+    if accept_encodings.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def init_app(app):
+    if not app.config["COMPRESSION"]:
+        return
+    min_size = app.config["COMPRESSION_MIN_SIZE"]
+    level = app.config["COMPRESSION_LEVEL"]
+    br_quality = app.config["COMPRESSION_BR_QUALITY"]
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.direct_passthrough
+                or "Content-Encoding" in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or response.mimetype not in COMPRESSIBLE):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if response.is_streamed:
+            if request.accept_encodings.quality("gzip") > 0:
+                response.response = gzip_stream(response.response, level,
+                                                request.endpoint or "<unmatched>")
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers.pop("Content-Length", None)
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+
+        started = time.perf_counter()
+        compressed = compress(body, encoding, level, br_quality)
+        cpu_ms = (time.perf_counter() - started) * 1000
+        if len(compressed) >= len(body):
+            return response
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        endpoint = request.endpoint or "<unmatched>"
+        metrics.incr("compression.bytes_in", len(body))
+        metrics.incr("compression.bytes_out", len(compressed))
+        metrics.observe("compression.ratio_pct", 100 * len(compressed) / len(body), endpoint)
+        metrics.observe("compression.cpu_ms", cpu_ms, encoding)
+        log.debug("%s %s: %d -> %d bytes (%s, %.2f ms)", request.method, endpoint,
+                  len(body), len(compressed), encoding, cpu_ms)
+        return response
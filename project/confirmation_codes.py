@@ -0,0 +1,88 @@
+# project/confirmation_codes.py
+"""Application-side allocator for registration confirmation codes.
+
+Each worker reserves a block of sequence numbers from ``code_sequences`` in
+one short transaction of its own, then hands codes out of that block in
+memory, so a booking knows its code before the INSERT and costs no extra
+round-trip. Blocks never overlap, so codes are unique across workers.
+
+Sequence numbers are run through a keyed Feistel permutation before being
+printed, so consecutive bookings get unrelated-looking codes:
+``CSN`` + 7 Crockford base32 characters (fits ``registration_id VARCHAR(10)``).
+The key (CONFIRMATION_CODE_KEY) must never change once codes are issued;
+a different key is a different permutation and could repeat an old code.
+"""
+import hashlib
+import hmac
+import threading
+
+from flask import current_app
+from sqlalchemy import text
+
+from . import db
+
+PREFIX = "CSN"
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford base32
+CODE_CHARS = 7
+CODE_SPACE = len(ALPHABET) ** CODE_CHARS       # 2**35
+
+_HALF_BITS = 18                                # Feistel over 36 bits, cycle-walked into 35
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+def _round(key: bytes, i: int, half: int) -> int:
+    digest = hmac.new(key, f"{i}:{half}".encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], "big") & _HALF_MASK
+
+
+def permute(n: int, key: bytes) -> int:
+    """Bijective, keyed scramble of ``n`` within ``[0, CODE_SPACE)``."""
+    while True:
+        left, right = n >> _HALF_BITS, n & _HALF_MASK
+        for i in range(_ROUNDS):
+            left, right = right, left ^ _round(key, i, right)
+        n = (left << _HALF_BITS) | right
+        if n < CODE_SPACE:
+            return n
+
+
+def format_code(n: int) -> str:
+    chars = []
+    for _ in range(CODE_CHARS):
+        n, r = divmod(n, len(ALPHABET))
+        chars.append(ALPHABET[r])
+    return PREFIX + "".join(reversed(chars))
+
+
+class CodeAllocator:
+    def __init__(self, sequence="registration"):
+        self.sequence = sequence
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def reserve_block(self, size):
+        """Claim ``size`` sequence numbers; returns the half-open range ``(start, end)``."""
+        # Own connection/transaction: the row lock on code_sequences is held
+        # only for this UPDATE, never for the length of a booking.
+        with db.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE code_sequences
+                SET next_value = LAST_INSERT_ID(next_value + :size)
+                WHERE name = :name
+            """), {"size": size, "name": self.sequence})
+            end = conn.execute(text("SELECT LAST_INSERT_ID()")).scalar()
+        return end - size, end
+
+    def next_code(self) -> str:
+        cfg = current_app.config
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self.reserve_block(cfg["CONFIRMATION_CODE_BLOCK"])
+            n = self._next
+            self._next += 1
+        return format_code(permute(n, cfg["CONFIRMATION_CODE_KEY"].encode()))
+
+
+code_allocator = CodeAllocator()
@@ -42,3 +42,6 @@ DESCRIBE Users;
 ALTER TABLE Users MODIFY department_id INT NULL;
 
 
+
+-- NOTE: schema changes after Sprint 2 are versioned migrations in
+-- project/migrations/ (apply with `flask schema upgrade`), not ad-hoc ALTERs here.
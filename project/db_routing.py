@@ -0,0 +1,40 @@
+# project/db_routing.py
+"""Send pure reads to the read replica (the ``replica`` bind) when one is set up.
+
+Writes, and everything inside the booking transactions, keep using
+``db.session.execute`` on the primary. After a user's own booking commits,
+``mark_recent_write()`` pins that user's reads to the primary for
+``REPLICA_STICKY_SECONDS`` so they never see their booking missing because
+the replica is a little behind.
+"""
+import time
+
+from flask import current_app, session
+
+from . import db
+
+REPLICA_BIND = "replica"
+
+
+def replica_engine():
+    """The replica engine to read from, or None to stay on the primary."""
+    if REPLICA_BIND not in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        return None
+    if session.get("_rw_until", 0) > time.time():
+        return None
+    return db.engines[REPLICA_BIND]
+
+
+def read_execute(statement, params=None):
+    """``db.session.execute`` for read-only statements, routed to the replica."""
+    engine = replica_engine()
+    if engine is None:
+        return db.session.execute(statement, params)
+    return db.session.execute(statement, params, bind_arguments={"bind": engine})
+
+
+def mark_recent_write():
+    """Keep this user's reads on the primary for a short read-your-writes window."""
+    window = current_app.config["REPLICA_STICKY_SECONDS"]
+    if window > 0 and REPLICA_BIND in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        session["_rw_until"] = time.time() + window
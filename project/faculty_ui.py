@@ -1,8 +1,15 @@
 # project/faculty_ui.py
-from flask import Blueprint, render_template, request, flash
+from flask import Blueprint, render_template, request, flash, Response
 from flask_login import login_required
+from markupsafe import escape
 from . import db
+from .db_routing import read_execute, replica_engine
+from .pagination import decode_cursor, encode_cursor
+from .reference_data import ref_data
+from .search import search_appointments
 from sqlalchemy import text
+import csv
+import io
 
 faculty_ui = Blueprint("faculty_ui", __name__)
 
@@ -18,26 +25,143 @@ def faculty_dashboard():
 # ==========================
 # PRINT EXAM LOG
 # ==========================
+PRINT_LOG_PAGE_SIZE = 50
+EXPORT_CHUNK_ROWS = 1000
+
+_SORT_TIME = "CAST(COALESCE(e.exam_time, '00:00:00') AS TIME)"
+
+def _print_log_filters():
+    """Filters shared by the paged view and the export, straight from the query string."""
+    return {
+        "start": (request.args.get("start") or "").strip(),
+        "end": (request.args.get("end") or "").strip(),
+        "location_id": request.args.get("location_id", type=int),
+        "course": (request.args.get("course") or "").strip(),
+    }
+
+# Shared with tools/check_query_plans.py, which EXPLAINs the page and export forms
+PRINT_LOG_SQL = f"""
+    SELECT r.id              AS reg_id,
+           r.registration_id AS confirmation_code,
+           r.status          AS status,
+           u.name            AS student_name,
+           u.nshe_id         AS nshe_id,
+           c.course_code     AS course_code,
+           e.exam_type       AS exam_type,
+           e.exam_date       AS exam_date,
+           e.exam_time       AS exam_time,
+           {_SORT_TIME}      AS sort_time,
+           l.name            AS location
+    FROM Registrations r
+    JOIN Exams   e ON e.id = r.exam_id
+    JOIN Users   u ON u.id = r.user_id
+    JOIN Courses c ON c.id = e.course_id
+    LEFT JOIN Locations l ON l.id = e.location_id
+    {{where}}
+    ORDER BY e.exam_date, sort_time, r.id
+"""
+
+def print_log_sql(filters, cursor=None, limit=None):
+    """Build the print log SELECT ordered by (exam_date, exam_time, id)."""
+    where, params = [], {}
+    if filters["start"]:
+        where.append("e.exam_date >= :start")
+        params["start"] = filters["start"]
+    if filters["end"]:
+        where.append("e.exam_date <= :end")
+        params["end"] = filters["end"]
+    if filters["location_id"]:
+        where.append("e.location_id = :location_id")
+        params["location_id"] = filters["location_id"]
+    if filters["course"]:
+        where.append("c.course_code = :course")
+        params["course"] = filters["course"].upper()
+    if cursor:
+        where.append(f"(e.exam_date, {_SORT_TIME}, r.id) > (:c_date, :c_time, :c_id)")
+        params.update(c_date=cursor[0], c_time=cursor[1], c_id=cursor[2])
+
+    sql = PRINT_LOG_SQL.format(where="WHERE " + " AND ".join(where) if where else "")
+    if limit:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+    return text(sql), params
+
 @faculty_ui.route("/faculty/print_log", methods=["GET"])
 @login_required
 def faculty_print_log():
-    """Display a list of all exam appointments for faculty viewing or printing."""
+    """One page of exam appointments for faculty viewing or printing."""
+    filters = _print_log_filters()
+    after = (request.args.get("after") or "").strip()
+    cursor = decode_cursor(after, 3) if after else None
+    results, next_cursor, locations = [], None, []
     try:
-        query = text("""
-            SELECT e.exam_name, e.exam_date, e.exam_location,
-                   s.first_name, s.last_name, r.status
-            FROM registrations r
-            JOIN exams e ON e.exam_id = r.exam_id
-            JOIN users s ON s.id = r.student_id
-            ORDER BY e.exam_date
-        """)
-        results = db.session.execute(query).fetchall()
+        query, params = print_log_sql(filters, cursor, PRINT_LOG_PAGE_SIZE + 1)
+        rows = read_execute(query, params).mappings().all()
+        results = [dict(r) for r in rows[:PRINT_LOG_PAGE_SIZE]]
+        if len(rows) > PRINT_LOG_PAGE_SIZE:
+            last = results[-1]
+            next_cursor = encode_cursor(last["exam_date"], last["sort_time"], last["reg_id"])
+        locations = list(ref_data().locations)
     except Exception as e:
-        results = []
         flash("Error loading exam log. Please try again.", "error")
         print("Faculty print log error:", e)
 
-    return render_template("faculty_print_log.html", results=results)
+    return render_template("faculty_print_log.html", results=results, filters=filters,
+                           locations=locations, next_cursor=next_cursor, paged=bool(cursor))
+
+_EXPORT_HEADER = ["Code", "Student", "NSHE", "Course", "Exam", "Date", "Time", "Location", "Status"]
+
+def _export_fields(row):
+    return [row.confirmation_code, row.student_name, row.nshe_id or "", row.course_code,
+            row.exam_type, row.exam_date, row.exam_time or "", row.location or "", row.status]
+
+def _stream_rows(engine, query, params):
+    """Yield lists of rows from a server-side cursor, EXPORT_CHUNK_ROWS at a time."""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query, params)
+        for chunk in result.partitions(EXPORT_CHUNK_ROWS):
+            yield chunk
+
+def _csv_chunks(chunks):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(_EXPORT_HEADER)
+    for chunk in chunks:
+        writer.writerows(_export_fields(row) for row in chunk)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+def _printable_chunks(chunks):
+    yield ("<!doctype html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+           "<title>Exam Log</title><style>body{font-family:sans-serif}"
+           "table{border-collapse:collapse;width:100%}th,td{border:1px solid #999;"
+           "padding:4px;font-size:12px}thead{display:table-header-group}</style>"
+           "</head><body onload=\"window.print()\"><h1>Exam Log</h1><table><thead><tr>")
+    yield "".join(f"<th>{escape(h)}</th>" for h in _EXPORT_HEADER) + "</tr></thead><tbody>"
+    for chunk in chunks:
+        yield "".join(
+            "<tr>" + "".join(f"<td>{escape(v)}</td>" for v in _export_fields(row)) + "</tr>"
+            for row in chunk
+        )
+    yield "</tbody></table></body></html>"
+
+@faculty_ui.route("/faculty/print_log/export", methods=["GET"])
+@login_required
+def faculty_print_log_export():
+    """Stream the whole (filtered) log as CSV or a printable page in constant memory."""
+    fmt = request.args.get("format", "csv")
+    query, params = print_log_sql(_print_log_filters())
+    engine = replica_engine() or db.engine
+    chunks = _stream_rows(engine, query, params)
+
+    if fmt == "print":
+        return Response(_printable_chunks(chunks), mimetype="text/html")
+    resp = Response(_csv_chunks(chunks), mimetype="text/csv")
+    resp.headers["Content-Disposition"] = "attachment; filename=exam_log.csv"
+    return resp
 
 # ==========================
 # SEARCH APPOINTMENTS
@@ -45,26 +169,16 @@ def faculty_print_log():
 @faculty_ui.route("/faculty/search_appointments", methods=["GET", "POST"])
 @login_required
 def faculty_search_appointments():
-    """Allows faculty to search for student appointments by name, exam, or ID."""
-    results = []
-    if request.method == "POST":
-        search_term = request.form.get("search_term")
+    """Search appointments by student name, NSHE ID, confirmation code, course or exam type."""
+    search_term = (request.values.get("q") or request.values.get("search_term") or "").strip()
+    page = request.args.get("page", 1, type=int)
+    results, has_next = [], False
+    if search_term:
         try:
-            query = text("""
-                SELECT e.exam_name, e.exam_date, e.exam_location,
-                       s.first_name, s.last_name, r.status, r.exam_id
-                FROM registrations r
-                JOIN exams e ON e.exam_id = r.exam_id
-                JOIN users s ON s.id = r.student_id
-                WHERE s.first_name LIKE :term
-                   OR s.last_name LIKE :term
-                   OR e.exam_name LIKE :term
-                   OR r.exam_id LIKE :term
-                ORDER BY e.exam_date
-            """)
-            results = db.session.execute(query, {"term": f"%{search_term}%"}).fetchall()
+            results, has_next = search_appointments(search_term, page)
         except Exception as e:
             flash("Error searching appointments. Please try again.", "error")
             print("Faculty search error:", e)
 
-    return render_template("faculty_search_appointments.html", results=results)
+    return render_template("faculty_search_appointments.html", results=results,
+                           q=search_term, page=page, has_next=has_next)
@@ -0,0 +1,59 @@
+# project/fragment_cache.py
+"""Rendered-HTML fragments keyed per exam, for the exam listing page.
+
+``/student/exams`` renders one table row per upcoming exam, and every
+student sees the same rows between bookings. Each exam's row is rendered
+once and kept with the values it was rendered from; when any of them
+changes (a booking moves ``remaining``, an exam is edited) the next request
+re-renders just that row. Because the check runs against the values the
+listing query just read, bookings made through other workers invalidate
+rows here too.
+"""
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from markupsafe import Markup
+
+from . import metrics
+
+
+class FragmentCache:
+    def __init__(self, max_entries=5000):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def render(self, template_name, key, signature, **context):
+        """Return the cached fragment for ``key`` if ``signature`` still matches, else render it."""
+        cache_key = (template_name, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(cache_key)
+                metrics.incr("fragment.hit")
+                return entry[1]
+        metrics.incr("fragment.miss")
+
+        html = Markup(current_app.jinja_env.get_template(template_name).render(**context))
+        with self._lock:
+            self._entries[cache_key] = (signature, html)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+fragment_cache = FragmentCache()
+
+
+def init_app(app):
+    fragment_cache.max_entries = app.config["FRAGMENT_CACHE_SIZE"]
+    metrics.register_gauge("fragment.cached", fragment_cache.size)
@@ -0,0 +1,169 @@
+# project/idempotency.py
+"""``Idempotency-Key`` support for the JSON register / cancel / reschedule API.
+
+A JSON request carrying an ``Idempotency-Key`` header is recorded per user in
+a SQLite store shared by every worker on the host (``IDEMPOTENCY_STORE``,
+default ``<instance>/idempotency.sqlite3``). Within ``IDEMPOTENCY_WINDOW_SECONDS``
+a repeat of the key gets the first response back (status, body, Location)
+without running the view, so it never reaches the locking transaction:
+
+* same key while the first request is still running: 409 + Retry-After;
+* same key with a different method, path or body: 422;
+* 5xx responses are not stored, so the client's retry runs for real.
+
+The store is bounded: expired keys are dropped on every write and, past
+``IDEMPOTENCY_MAX_KEYS``, the oldest keys are evicted first.
+"""
+import functools
+import hashlib
+import os
+import time
+
+from flask import Response, current_app, jsonify, request
+from flask_login import current_user
+
+from . import metrics
+from .sqlite_store import SQLiteStore
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        user_id     INTEGER NOT NULL,
+        key         TEXT    NOT NULL,
+        fingerprint TEXT    NOT NULL,
+        created     REAL    NOT NULL,
+        status      INTEGER,
+        body        BLOB,
+        mimetype    TEXT,
+        location    TEXT,
+        PRIMARY KEY (user_id, key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created);
+"""
+
+
+class IdempotencyStore(SQLiteStore):
+    def __init__(self):
+        super().__init__()
+        self.window = 0
+        self.max_keys = 0
+
+    def configure(self, path, window_seconds, max_keys):
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._open(path, _SCHEMA)
+
+    def claim(self, user_id, key, fingerprint):
+        """Reserve the key, or return the row already recorded for it.
+
+        Returns None when this request now owns the key, else
+        ``(fingerprint, status, body, mimetype, location)``; ``status`` is None
+        while the first request is still running.
+        """
+        def claim(conn):
+            now = time.time()
+            conn.execute("DELETE FROM responses WHERE created < ?", (now - self.window,))
+            row = conn.execute(
+                "SELECT fingerprint, status, body, mimetype, location FROM responses"
+                " WHERE user_id = ? AND key = ?", (user_id, key),
+            ).fetchone()
+            if row is not None:
+                return row
+            conn.execute(
+                "INSERT INTO responses (user_id, key, fingerprint, created) VALUES (?, ?, ?, ?)",
+                (user_id, key, fingerprint, now),
+            )
+            evicted = conn.execute("""
+                DELETE FROM responses WHERE rowid IN (
+                    SELECT rowid FROM responses ORDER BY created DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_keys,)).rowcount
+            if evicted > 0:
+                metrics.incr("idempotency.evicted", evicted)
+            return None
+        return self._write(claim)
+
+    def complete(self, user_id, key, response):
+        self._write(lambda conn: conn.execute(
+            "UPDATE responses SET status = ?, body = ?, mimetype = ?, location = ?"
+            " WHERE user_id = ? AND key = ?",
+            (response.status_code, response.get_data(), response.mimetype,
+             response.headers.get("Location"), user_id, key),
+        ))
+
+    def forget(self, user_id, key):
+        self._write(lambda conn: conn.execute(
+            "DELETE FROM responses WHERE user_id = ? AND key = ?", (user_id, key),
+        ))
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _fingerprint():
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def idempotent(view):
+    """Replay the stored response for a repeated ``Idempotency-Key`` (JSON requests only)."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.is_json or not current_app.config["IDEMPOTENCY"]:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"ok": False, "error": f"{HEADER} is too long."}), 400
+
+        user_id = int(current_user.id)
+        fingerprint = _fingerprint()
+        seen = idempotency_store.claim(user_id, key, fingerprint)
+        if seen is not None:
+            stored_fingerprint, status, body, mimetype, location = seen
+            if stored_fingerprint != fingerprint:
+                metrics.incr("idempotency.mismatch")
+                return jsonify({"ok": False, "error":
+                                f"{HEADER} was already used for a different request."}), 422
+            if status is None:
+                metrics.incr("idempotency.in_progress")
+                resp = jsonify({"ok": False, "error": "This request is still being processed."})
+                resp.status_code = 409
+                resp.headers["Retry-After"] = "1"
+                return resp
+            metrics.incr("idempotency.replayed")
+            resp = Response(body, status=status, mimetype=mimetype)
+            if location:
+                resp.headers["Location"] = location
+            resp.headers["Idempotent-Replayed"] = "true"
+            return resp
+
+        try:
+            resp = current_app.make_response(view(*args, **kwargs))
+        except BaseException:
+            idempotency_store.forget(user_id, key)
+            raise
+        if resp.status_code >= 500:
+            # transient failures (busy, lock timeouts) must stay retryable
+            idempotency_store.forget(user_id, key)
+        else:
+            idempotency_store.complete(user_id, key, resp)
+            metrics.incr("idempotency.stored")
+        return resp
+    return wrapper
+
+
+def init_app(app):
+    if not app.config["IDEMPOTENCY"]:
+        return
+    path = app.config["IDEMPOTENCY_STORE"] or os.path.join(app.instance_path, "idempotency.sqlite3")
+    idempotency_store.configure(path, app.config["IDEMPOTENCY_WINDOW_SECONDS"],
+                                app.config["IDEMPOTENCY_MAX_KEYS"])
+    metrics.register_gauge("idempotency.keys", idempotency_store.size)
@@ -0,0 +1,115 @@
+# project/identity_cache.py
+"""Cached identity for Flask-Login's ``user_loader``.
+
+Every authenticated request used to load the User row and then lazily its
+Role. The loader now returns a ``UserSnapshot`` built by one joined query and
+kept per worker in a bounded LRU for ``IDENTITY_CACHE_TTL`` seconds, so
+requests that only need who the user is do no Users queries at all.
+
+Any ORM update or delete of a User evicts that user here; other workers pick
+the change up when their entry's TTL runs out. Code that needs the live row
+(passwords, edits) should load ``User`` itself.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask_login import UserMixin
+from sqlalchemy import event, text
+
+from . import db, metrics
+
+RoleRef = namedtuple("RoleRef", "id name")
+
+
+class UserSnapshot(UserMixin):
+    """Read-only stand-in for ``User`` carrying what templates and routes read."""
+
+    def __init__(self, row):
+        self.id = row.id
+        self.name = row.name
+        self.email = row.email
+        self.nshe_id = row.nshe_id
+        self.employee_id = row.employee_id
+        self.role_id = row.role_id
+        self.role = RoleRef(row.role_id, row.role_name) if row.role_name else None
+        self.department_id = row.department_id
+        self.department = row.department_name
+        self.major_id = row.major_id
+        self.major = row.major_name
+
+
+class IdentityCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.ttl = 60.0
+        self.max_size = 5000
+
+    def configure(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def get(self, user_id: int):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                metrics.incr("identity.hit")
+                return entry[1]
+        metrics.incr("identity.miss")
+
+        snapshot = _load(user_id)
+        if snapshot is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, snapshot)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+identity_cache = IdentityCache()
+
+
+def _load(user_id: int):
+    row = db.session.execute(text("""
+        SELECT u.id, u.name, u.email, u.nshe_id, u.employee_id,
+               u.role_id, r.name AS role_name,
+               u.department_id, d.name AS department_name,
+               u.major_id, m.name AS major_name
+        FROM Users u
+        LEFT JOIN Roles r       ON r.id = u.role_id
+        LEFT JOIN Departments d ON d.id = u.department_id
+        LEFT JOIN Majors m      ON m.id = u.major_id
+        WHERE u.id = :uid
+    """), {"uid": user_id}).first()
+    return UserSnapshot(row) if row else None
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop this worker's cached identity for ``user_id``."""
+    identity_cache.invalidate(int(user_id))
+
+
+def _evict_changed_user(mapper, connection, target):
+    if target.id is not None:
+        invalidate_user(target.id)
+
+
+def init_app(app):
+    from .models import User
+
+    identity_cache.configure(app.config["IDENTITY_CACHE_TTL"], app.config["IDENTITY_CACHE_SIZE"])
+    if not event.contains(User, "after_update", _evict_changed_user):
+        event.listen(User, "after_update", _evict_changed_user)
+        event.listen(User, "after_delete", _evict_changed_user)
+    metrics.register_gauge("identity.cached", identity_cache.size)
@@ -0,0 +1,82 @@
+# project/metrics.py
+"""Process-wide counters and histograms, exposed as JSON on ``/__metrics``.
+
+Each worker keeps its own numbers; scrape every worker (or sum them) to get
+the whole picture.
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+# Upper bounds shared by every histogram; the last bucket catches the rest.
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_histograms = defaultdict(dict)
+_gauges = {}
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self):
+        labels = [f"le_{b}" for b in BUCKETS] + ["inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def observe(name: str, value: float, label: str = "all") -> None:
+    """Record ``value`` in histogram ``name``, split by ``label`` (e.g. endpoint)."""
+    with _lock:
+        hist = _histograms[name].get(label)
+        if hist is None:
+            hist = _histograms[name][label] = _Histogram()
+        hist.add(value)
+
+
+def register_gauge(name: str, fn) -> None:
+    """Register a zero-argument callable sampled on every snapshot."""
+    with _lock:
+        _gauges[name] = fn
+
+
+def snapshot() -> dict:
+    with _lock:
+        gauges = dict(_gauges)
+    sampled = {}
+    for name, fn in gauges.items():
+        try:
+            sampled[name] = fn()
+        except Exception:
+            sampled[name] = None
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": sampled,
+            "histograms": {
+                name: {label: h.as_dict() for label, h in by_label.items()}
+                for name, by_label in _histograms.items()
+            },
+        }
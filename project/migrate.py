@@ -0,0 +1,96 @@
+# project/migrate.py
+"""Versioned schema migrations.
+
+Each file in ``project/migrations`` named ``NNNN_description.sql`` is one
+migration; they run in version order and every applied version is recorded
+in ``schema_migrations``. Statements are split on a ``;`` at the end of a
+line (no DELIMITER blocks). MySQL commits DDL implicitly, so a migration
+that fails halfway has to be finished or undone by hand before re-running.
+
+    flask schema status
+    flask schema upgrade
+"""
+import os
+import re
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from . import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+_FILE_RE = re.compile(r"^(\d{4})_([\w-]+)\.sql$")
+
+
+def available_migrations():
+    """Return ``[(version, name, path)]`` sorted by version."""
+    found = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        m = _FILE_RE.match(filename)
+        if m:
+            found.append((m.group(1), m.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return sorted(found)
+
+
+def split_statements(sql: str):
+    lines = [ln for ln in sql.splitlines() if not ln.strip().startswith("--")]
+    return [stmt.strip() for stmt in re.split(r";\s*$", "\n".join(lines), flags=re.M)
+            if stmt.strip()]
+
+
+def _ensure_table():
+    db.session.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version    VARCHAR(16)  PRIMARY KEY,
+            name       VARCHAR(150) NOT NULL,
+            applied_at TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    db.session.commit()
+
+
+def applied_versions():
+    _ensure_table()
+    return {r[0] for r in db.session.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def upgrade(echo=print):
+    """Apply every pending migration in order; returns the versions applied."""
+    done = applied_versions()
+    applied = []
+    for version, name, path in available_migrations():
+        if version in done:
+            continue
+        with open(path, encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        echo(f"Applying {version}_{name} ({len(statements)} statement(s))")
+        conn = db.session.connection()
+        for stmt in statements:
+            conn.exec_driver_sql(stmt)
+        db.session.execute(text("""
+            INSERT INTO schema_migrations (version, name) VALUES (:v, :n)
+        """), {"v": version, "n": name})
+        db.session.commit()
+        applied.append(version)
+    return applied
+
+
+@click.group("schema")
+def schema_cli():
+    """Versioned schema migrations (project/migrations)."""
+
+
+@schema_cli.command("status")
+@with_appcontext
+def status_command():
+    done = applied_versions()
+    for version, name, _ in available_migrations():
+        click.echo(f"[{'x' if version in done else ' '}] {version}_{name}")
+
+
+@schema_cli.command("upgrade")
+@with_appcontext
+def upgrade_command():
+    applied = upgrade(echo=click.echo)
+    click.echo(f"{len(applied)} migration(s) applied." if applied else "Schema is up to date.")
@@ -0,0 +1,3 @@
+-- Baseline: the schema produced by database.sql plus the hand-applied
+-- ALTERs in database_sprint2.sql. Nothing to run; recording this version
+-- marks the point where versioned migrations take over.
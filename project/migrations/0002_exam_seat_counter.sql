@@ -0,0 +1,14 @@
+-- Maintained per-exam seat counter (read by the availability queries, kept in
+-- sync by the booking routes). Backfill from Active registrations;
+-- `flask reconcile-seats` re-runs the same rebuild if it ever drifts.
+ALTER TABLE Exams
+    ADD COLUMN booked_count INT NOT NULL DEFAULT 0 AFTER capacity;
+
+UPDATE Exams e
+LEFT JOIN (
+    SELECT exam_id, COUNT(*) AS cnt
+    FROM Registrations
+    WHERE status = 'Active'
+    GROUP BY exam_id
+) r ON r.exam_id = e.id
+SET e.booked_count = IFNULL(r.cnt, 0);
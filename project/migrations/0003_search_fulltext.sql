@@ -0,0 +1,6 @@
+-- Faculty appointment search (project/search.py): FULLTEXT indexes for the
+-- ranked free-text path. Confirmation codes and NSHE IDs use the existing
+-- unique keys on Registrations.registration_id and Users.nshe_id.
+ALTER TABLE Users   ADD FULLTEXT INDEX ft_users_name (name);
+ALTER TABLE Exams   ADD FULLTEXT INDEX ft_exams_type (exam_type);
+ALTER TABLE Courses ADD FULLTEXT INDEX ft_courses_code_name (course_code, course_name);
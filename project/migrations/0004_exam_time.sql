@@ -0,0 +1,3 @@
+-- student_ui, search and the print log already select/sort on Exams.exam_time.
+ALTER TABLE Exams
+    ADD COLUMN exam_time TIME NULL AFTER exam_date;
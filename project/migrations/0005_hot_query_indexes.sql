@@ -0,0 +1,11 @@
+-- Covering indexes for the hot predicates (checked by tools/check_query_plans.py).
+
+-- Per-student active bookings: the 3-booking limit and the duplicate check.
+CREATE INDEX idx_reg_user_status_exam ON Registrations (user_id, status, exam_id);
+
+-- Per-exam active bookings: capacity guard and seat-counter reconciliation.
+CREATE INDEX idx_reg_exam_status ON Registrations (exam_id, status);
+
+-- Upcoming exam listing / availability: exam_date >= CURDATE()
+-- ORDER BY exam_date, exam_time, covering the seat columns (InnoDB adds id).
+CREATE INDEX idx_exams_date_time ON Exams (exam_date, exam_time, capacity, booked_count);
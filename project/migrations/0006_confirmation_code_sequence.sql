@@ -0,0 +1,11 @@
+-- Confirmation codes are now allocated by the app (project/confirmation_codes.py)
+-- from blocks reserved in this table, so the insert trigger that read
+-- information_schema on every Registrations insert goes away.
+CREATE TABLE code_sequences (
+    name       VARCHAR(32) PRIMARY KEY,
+    next_value BIGINT      NOT NULL
+);
+
+INSERT INTO code_sequences (name, next_value) VALUES ('registration', 1);
+
+DROP TRIGGER IF EXISTS id_generator;
@@ -0,0 +1,22 @@
+-- Short-lived seat holds taken when a student opens the review page
+-- (project/seat_holds.py). held_count is maintained alongside booked_count,
+-- so remaining = capacity - booked_count - held_count without aggregating.
+ALTER TABLE Exams
+    ADD COLUMN held_count INT NOT NULL DEFAULT 0 AFTER booked_count;
+
+CREATE TABLE SeatHolds (
+    id         INT AUTO_INCREMENT PRIMARY KEY,
+    exam_id    INT      NOT NULL,
+    user_id    INT      NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    UNIQUE KEY uq_seat_holds_exam_user (exam_id, user_id),
+    KEY idx_seat_holds_user (user_id),
+    KEY idx_seat_holds_expires (expires_at, exam_id),
+    CONSTRAINT fk_seat_holds_exam FOREIGN KEY (exam_id) REFERENCES Exams (id) ON DELETE CASCADE,
+    CONSTRAINT fk_seat_holds_user FOREIGN KEY (user_id) REFERENCES Users (id) ON DELETE CASCADE
+);
+
+-- Keep the upcoming-exam listing covered now that it reads held_count too.
+DROP INDEX idx_exams_date_time ON Exams;
+CREATE INDEX idx_exams_date_time ON Exams (exam_date, exam_time, capacity, booked_count, held_count);
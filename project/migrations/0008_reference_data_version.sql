@@ -0,0 +1,54 @@
+-- Reference data (Roles, Departments, Majors, Courses, Locations) is cached per
+-- worker (project/reference_data.py). Any write to those tables bumps this
+-- version, and workers reload when they see a new one.
+CREATE TABLE reference_data_version (
+    id      TINYINT PRIMARY KEY,
+    version BIGINT  NOT NULL
+);
+
+INSERT INTO reference_data_version (id, version) VALUES (1, 1);
+
+CREATE TRIGGER refdata_roles_ins AFTER INSERT ON Roles
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_roles_upd AFTER UPDATE ON Roles
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_roles_del AFTER DELETE ON Roles
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_departments_ins AFTER INSERT ON Departments
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_departments_upd AFTER UPDATE ON Departments
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_departments_del AFTER DELETE ON Departments
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_majors_ins AFTER INSERT ON Majors
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_majors_upd AFTER UPDATE ON Majors
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_majors_del AFTER DELETE ON Majors
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_courses_ins AFTER INSERT ON Courses
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_courses_upd AFTER UPDATE ON Courses
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_courses_del AFTER DELETE ON Courses
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_locations_ins AFTER INSERT ON Locations
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_locations_upd AFTER UPDATE ON Locations
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+
+CREATE TRIGGER refdata_locations_del AFTER DELETE ON Locations
+    FOR EACH ROW UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
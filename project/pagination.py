@@ -0,0 +1,18 @@
+# project/pagination.py
+"""Opaque keyset cursors shared by the paginated listings."""
+import base64
+
+
+def encode_cursor(*parts) -> str:
+    raw = "|".join(str(p) for p in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int):
+    """Return the ``size`` string parts of a cursor, or None if it is junk."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (ValueError, UnicodeDecodeError):
+        return None
+    parts = raw.split("|")
+    return parts if len(parts) == size else None
@@ -0,0 +1,120 @@
+# project/profiler.py
+"""Opt-in per-request SQL profiling (``SQL_PROFILING=1``).
+
+Hooks the SQLAlchemy engine and, for every request, records how many
+statements ran, how long they took in total, how many rows came back and
+which ones were slowest. Bound parameters are never logged, only their names.
+Per-endpoint histograms land in :mod:`project.metrics` (see ``/__metrics``)
+and requests over the configured thresholds are logged as warnings.
+"""
+import heapq
+import logging
+import re
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from . import db, metrics
+
+log = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+
+class RequestProfile:
+    __slots__ = ("statements", "db_seconds", "rows", "slowest")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.slowest = []  # min-heap of (seconds, seq, sql, params)
+
+
+def _redact(parameters):
+    """Keep the shape of the bound parameters, drop the values."""
+    if isinstance(parameters, dict):
+        return {k: "?" for k in parameters}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} rows>"
+        return ["?"] * len(parameters)
+    return None
+
+
+# The start time lives on the execution context rather than the connection, so
+# a statement that raises (no after_cursor_execute) leaves nothing behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_profiler_started", None)
+    if started is None or not has_request_context():
+        return
+    profile = g.get("sql_profile")
+    if profile is None:
+        return
+    elapsed = time.perf_counter() - started
+    profile.statements += 1
+    profile.db_seconds += elapsed
+    if cursor.description is not None and cursor.rowcount and cursor.rowcount > 0:
+        profile.rows += cursor.rowcount
+
+    top = g.sql_profile_top
+    entry = (elapsed, profile.statements, statement, parameters)
+    if len(profile.slowest) < top:
+        heapq.heappush(profile.slowest, entry)
+    elif elapsed > profile.slowest[0][0]:
+        heapq.heapreplace(profile.slowest, entry)
+
+
+def init_app(app):
+    if not app.config.get("SQL_PROFILING"):
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    slow_ms = app.config["SQL_PROFILE_SLOW_MS"]
+    max_statements = app.config["SQL_PROFILE_MAX_STATEMENTS"]
+    request_ms = app.config["SQL_PROFILE_REQUEST_MS"]
+    top = app.config["SQL_PROFILE_TOP"]
+
+    @app.before_request
+    def _start_profile():
+        g.sql_profile = RequestProfile()
+        g.sql_profile_top = top
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+
+        endpoint = request.endpoint or "<unmatched>"
+        db_ms = profile.db_seconds * 1000
+        metrics.observe("db.statements", profile.statements, endpoint)
+        metrics.observe("db.time_ms", db_ms, endpoint)
+        metrics.observe("db.rows", profile.rows, endpoint)
+        response.headers["Server-Timing"] = f"db;dur={db_ms:.1f};desc=\"{profile.statements} stmts\""
+
+        slowest = sorted(profile.slowest, reverse=True)
+        if (profile.statements > max_statements or db_ms > request_ms
+                or (slowest and slowest[0][0] * 1000 > slow_ms)):
+            log.warning(
+                "SQL hotspot %s %s: %d statements, %.1f ms DB, %d rows; slowest: %s",
+                request.method, endpoint, profile.statements, db_ms, profile.rows,
+                [
+                    {"ms": round(sec * 1000, 2),
+                     "sql": _WS_RE.sub(" ", sql).strip()[:300],
+                     "params": _redact(params)}
+                    for sec, _, sql, params in slowest
+                ],
+            )
+        return response
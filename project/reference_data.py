@@ -0,0 +1,133 @@
+# project/reference_data.py
+"""Per-worker cache of Roles, Departments, Majors, Courses and Locations.
+
+This data changes a few times a semester, so each worker loads all five
+tables once into dicts keyed by id and by lower-cased name. Every
+``REFDATA_CHECK_SECONDS`` the next caller reads ``reference_data_version``
+(bumped by triggers on those tables, migration 0008) and the cache reloads
+when it moved; it also reloads unconditionally after ``REFDATA_TTL``.
+``flask bump-refdata`` forces a reload everywhere after manual edits made
+with the triggers disabled.
+"""
+import threading
+import time
+from collections import namedtuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from . import db, metrics
+
+Role = namedtuple("Role", "id name")
+Department = namedtuple("Department", "id name")
+Major = namedtuple("Major", "id name department_id")
+Course = namedtuple("Course", "id course_code course_name department_id")
+Location = namedtuple("Location", "id name")
+
+
+class _Table:
+    """Rows of one table with O(1) lookup by id and by (case-insensitive) name."""
+
+    def __init__(self, rows, name_field="name"):
+        self.rows = rows
+        self._by_id = {r.id: r for r in rows}
+        self._by_name = {getattr(r, name_field).lower(): r for r in rows}
+
+    def get(self, row_id):
+        try:
+            return self._by_id.get(int(row_id))
+        except (TypeError, ValueError):
+            return None
+
+    def by_name(self, name):
+        return self._by_name.get((name or "").strip().lower())
+
+    def name_of(self, row_id, default=None):
+        row = self.get(row_id)
+        return row.name if row else default
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class ReferenceData:
+    def __init__(self, version, roles, departments, majors, courses, locations):
+        self.version = version
+        self.roles = _Table(roles)
+        self.departments = _Table(departments)
+        self.majors = _Table(majors)
+        self.courses = _Table(courses, name_field="course_code")
+        self.locations = _Table(locations)
+
+
+def _current_version():
+    return db.session.execute(text(
+        "SELECT version FROM reference_data_version WHERE id = 1"
+    )).scalar()
+
+
+def _load():
+    def rows(sql, cls):
+        return [cls(*r) for r in db.session.execute(text(sql)).all()]
+
+    return ReferenceData(
+        _current_version(),
+        rows("SELECT id, name FROM Roles ORDER BY id", Role),
+        rows("SELECT id, name FROM Departments ORDER BY name", Department),
+        rows("SELECT id, name, department_id FROM Majors ORDER BY name", Major),
+        rows("SELECT id, course_code, course_name, department_id FROM Courses ORDER BY course_code", Course),
+        rows("SELECT id, name FROM Locations ORDER BY name", Location),
+    )
+
+
+class ReferenceDataCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+
+    def get(self) -> ReferenceData:
+        cfg = current_app.config
+        now = time.monotonic()
+        data = self._data
+        if data is not None and now - self._checked_at < cfg["REFDATA_CHECK_SECONDS"]:
+            return data
+
+        with self._lock:
+            data = self._data  # another thread may have refreshed meanwhile
+            if data is not None and now - self._checked_at < cfg["REFDATA_CHECK_SECONDS"]:
+                return data
+            if data is not None and now - self._loaded_at < cfg["REFDATA_TTL"]:
+                self._checked_at = now
+                if _current_version() == data.version:
+                    return data
+            metrics.incr("refdata.reload")
+            self._data = _load()
+            self._loaded_at = self._checked_at = now
+            return self._data
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._data = None
+
+
+reference_cache = ReferenceDataCache()
+
+
+def ref_data() -> ReferenceData:
+    """The current reference data for this worker."""
+    return reference_cache.get()
+
+
+@click.command("bump-refdata")
+@with_appcontext
+def bump_refdata_command():
+    """Make every worker reload its reference-data cache."""
+    db.session.execute(text(
+        "UPDATE reference_data_version SET version = version + 1 WHERE id = 1"
+    ))
+    db.session.commit()
+    click.echo("Reference data version bumped.")
@@ -0,0 +1,113 @@
+# project/search.py
+"""Appointment search for faculty.
+
+Exact lookups go straight to unique-index probes:
+
+* a confirmation code (``CSN...``) -> ``Registrations.registration_id``
+* a 10-digit NSHE ID               -> ``Users.nshe_id``
+
+Anything else is matched against the FULLTEXT indexes on student name,
+exam type and course code/name (prefix match per word). Each index is probed
+on its own table and joined to Registrations through the foreign-key indexes,
+so nothing scans the full Registrations x Exams x Users join. A registration
+that matches in several places (name *and* course) ranks higher.
+"""
+import re
+
+from sqlalchemy import text
+
+from .db_routing import read_execute
+
+CONFIRMATION_RE = re.compile(r'^CSN[0-9A-Z]{1,7}$', re.I)
+NSHE_RE = re.compile(r'^\d{10}$')
+# Words shorter than innodb_ft_min_token_size (3) are not in the index
+MIN_TOKEN = 3
+PAGE_SIZE = 25
+
+_COLUMNS = """
+    r.id                AS reg_id,
+    r.registration_id   AS confirmation_code,
+    r.status            AS status,
+    u.name              AS student_name,
+    u.nshe_id           AS nshe_id,
+    c.course_code       AS course_code,
+    e.exam_type         AS exam_type,
+    e.exam_date         AS exam_date,
+    e.exam_time         AS exam_time,
+    l.name              AS location
+"""
+
+_JOINS = """
+    JOIN Users       u ON u.id = r.user_id
+    JOIN Exams       e ON e.id = r.exam_id
+    JOIN Courses     c ON c.id = e.course_id
+    LEFT JOIN Locations l ON l.id = e.location_id
+"""
+
+_EXACT_SQL = f"""
+    SELECT {_COLUMNS}, 1 AS score
+    FROM Registrations r
+    {_JOINS}
+    WHERE {{predicate}}
+    ORDER BY e.exam_date, r.id
+    LIMIT :limit OFFSET :offset
+"""
+
+_RANKED_SQL = f"""
+    SELECT {_COLUMNS}, ranked.score AS score
+    FROM (
+        SELECT hit.id, SUM(hit.score) AS score
+        FROM (
+            SELECT r.id, MATCH(u.name) AGAINST (:q IN BOOLEAN MODE) AS score
+            FROM Users u
+            JOIN Registrations r ON r.user_id = u.id
+            WHERE MATCH(u.name) AGAINST (:q IN BOOLEAN MODE)
+            UNION ALL
+            SELECT r.id, MATCH(e.exam_type) AGAINST (:q IN BOOLEAN MODE)
+            FROM Exams e
+            JOIN Registrations r ON r.exam_id = e.id
+            WHERE MATCH(e.exam_type) AGAINST (:q IN BOOLEAN MODE)
+            UNION ALL
+            SELECT r.id, MATCH(c.course_code, c.course_name) AGAINST (:q IN BOOLEAN MODE)
+            FROM Courses c
+            JOIN Exams e         ON e.course_id = c.id
+            JOIN Registrations r ON r.exam_id = e.id
+            WHERE MATCH(c.course_code, c.course_name) AGAINST (:q IN BOOLEAN MODE)
+        ) hit
+        GROUP BY hit.id
+        ORDER BY score DESC, hit.id DESC
+        LIMIT :limit OFFSET :offset
+    ) ranked
+    JOIN Registrations r ON r.id = ranked.id
+    {_JOINS}
+    ORDER BY ranked.score DESC, r.id DESC
+"""
+
+
+def fulltext_query(term: str) -> str:
+    """Turn free text into a BOOLEAN MODE query: every usable word as a prefix."""
+    words = [w for w in re.split(r'[^0-9A-Za-z]+', term) if len(w) >= MIN_TOKEN]
+    return " ".join(f"{w}*" for w in words)
+
+
+def search_appointments(term: str, page: int = 1, per_page: int = PAGE_SIZE):
+    """Return ``(rows, has_next)`` for one page of results."""
+    term = (term or "").strip()
+    page = max(int(page), 1)
+    params = {"limit": per_page + 1, "offset": (page - 1) * per_page}
+
+    if CONFIRMATION_RE.match(term):
+        sql = _EXACT_SQL.format(predicate="r.registration_id = :code")
+        params["code"] = term.upper()
+    elif NSHE_RE.match(term):
+        sql = _EXACT_SQL.format(predicate="u.nshe_id = :nshe")
+        params["nshe"] = term
+    else:
+        q = fulltext_query(term)
+        if not q:
+            return [], False
+        sql = _RANKED_SQL
+        params["q"] = q
+
+    rows = read_execute(text(sql), params).mappings().all()
+    return [dict(r) for r in rows[:per_page]], len(rows) > per_page
@@ -0,0 +1,73 @@
+# project/seat_counter.py
+"""Maintained per-exam seat counters (``Exams.booked_count`` / ``held_count``).
+
+The booking routes adjust the counters inside their own locking transactions,
+so availability reads never have to aggregate the Registrations table.
+``held_count`` tracks seat holds (see seat_holds.py); remaining seats are
+``capacity - booked_count - held_count``.
+"""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, text
+
+from . import db
+
+
+def adjust_booked_count(exam_id: int, delta: int) -> None:
+    """Shift an exam's booked_count by ``delta``.
+
+    Must be called inside the same transaction that changes the
+    registration, so the counter commits (or rolls back) with it.
+    """
+    if not delta:
+        return
+    db.session.execute(text("""
+        UPDATE Exams
+        SET booked_count = GREATEST(booked_count + :delta, 0)
+        WHERE id = :eid
+    """), {"eid": exam_id, "delta": delta})
+
+
+def seats_remaining(*exam_ids: int) -> dict:
+    """Return ``{exam_id: remaining}`` as seen by the current transaction."""
+    rows = db.session.execute(text("""
+        SELECT id, GREATEST(capacity - booked_count - held_count, 0) AS remaining
+        FROM Exams
+        WHERE id IN :ids
+    """).bindparams(bindparam("ids", expanding=True)), {"ids": list(exam_ids)}).all()
+    return {int(r.id): int(r.remaining) for r in rows}
+
+
+def reconcile_booked_counts() -> int:
+    """Rebuild every counter from the Active registrations and the seat holds.
+
+    Returns the number of exams whose counters had drifted.
+    """
+    changed = db.session.execute(text("""
+        UPDATE Exams e
+        LEFT JOIN (
+            SELECT exam_id, COUNT(*) AS cnt
+            FROM Registrations
+            WHERE status = 'Active'
+            GROUP BY exam_id
+        ) r ON r.exam_id = e.id
+        LEFT JOIN (
+            SELECT exam_id, COUNT(*) AS cnt
+            FROM SeatHolds
+            GROUP BY exam_id
+        ) h ON h.exam_id = e.id
+        SET e.booked_count = IFNULL(r.cnt, 0),
+            e.held_count = IFNULL(h.cnt, 0)
+        WHERE e.booked_count <> IFNULL(r.cnt, 0)
+           OR e.held_count <> IFNULL(h.cnt, 0)
+    """)).rowcount
+    db.session.commit()
+    return changed
+
+
+@click.command("reconcile-seats")
+@with_appcontext
+def reconcile_seats_command():
+    """Recompute Exams.booked_count / held_count from Registrations and SeatHolds."""
+    changed = reconcile_booked_counts()
+    click.echo(f"Reconciled seat counters; {changed} exam(s) corrected.")
@@ -0,0 +1,246 @@
+# project/seat_holds.py
+"""Temporary seat holds between the review page and confirmation.
+
+Opening ``register_review`` takes a hold: a SeatHolds row plus
+``Exams.held_count + 1``, under the exam row lock, so the seat counts against
+``remaining`` everywhere (capacity - booked_count - held_count). Confirming
+converts the hold into the registration without re-checking capacity. A
+student holds one seat at a time: once a new hold commits, the old ones are
+released, each in its own transaction under its own exam's lock.
+
+Expired holds are released in batches by ``sweep_expired_holds``, run by a
+background thread in each worker (``SEAT_HOLD_SWEEPER``) and by
+``flask sweep-holds``. An expired hold that has not been swept yet still
+counts, and is still honoured on confirmation, so the counters never
+disagree with the table.
+"""
+import threading
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+
+from . import db, metrics
+from .availability_hub import availability_hub
+from .seat_counter import seats_remaining
+from .txn_retry import run_in_transaction
+
+
+def _adjust_held_count(exam_id: int, delta: int) -> None:
+    if not delta:
+        return
+    db.session.execute(text("""
+        UPDATE Exams
+        SET held_count = GREATEST(held_count + :delta, 0)
+        WHERE id = :eid
+    """), {"eid": exam_id, "delta": delta})
+
+
+def _release_locked(exam_id: int, user_id: int) -> int:
+    """Delete the student's hold on ``exam_id`` under that exam's row lock (one transaction)."""
+    def release():
+        db.session.execute(text("""
+            SELECT id FROM Exams WHERE id = :eid FOR UPDATE
+        """), {"eid": exam_id})
+        removed = db.session.execute(text("""
+            DELETE FROM SeatHolds WHERE exam_id = :eid AND user_id = :sid
+        """), {"eid": exam_id, "sid": user_id}).rowcount
+        _adjust_held_count(exam_id, -removed)
+        return removed
+
+    return run_in_transaction(release, route="seat_hold_release")
+
+
+def _release_other_holds(exam_id: int, user_id: int) -> list:
+    """Drop the student's holds on other exams; returns those exam ids.
+
+    Runs after the new hold has committed, one transaction per exam, each
+    locking its own exam row before touching SeatHolds (the sweeper's
+    order), so no transaction ever holds two exam locks.
+    """
+    others = db.session.execute(text("""
+        SELECT exam_id FROM SeatHolds
+        WHERE user_id = :sid AND exam_id <> :eid
+    """), {"sid": user_id, "eid": exam_id}).scalars().all()
+    db.session.commit()
+    return [int(other) for other in others if _release_locked(int(other), user_id)]
+
+
+def place_hold(exam_id: int, user_id: int):
+    """Hold a seat on ``exam_id`` for the student, or refresh their existing hold.
+
+    Returns ``(expires_at, reason)``: the hold's expiry (a datetime), or None
+    with ``reason`` "full", "registered", "limit" or "not_found".
+    """
+    ttl = current_app.config["SEAT_HOLD_SECONDS"]
+
+    def hold():
+        exam = db.session.execute(text("""
+            SELECT capacity, booked_count, held_count
+            FROM Exams
+            WHERE id = :eid
+            FOR UPDATE
+        """), {"eid": exam_id}).first()
+        if not exam:
+            return None, "not_found"
+
+        refreshed = db.session.execute(text("""
+            UPDATE SeatHolds
+            SET expires_at = DATE_ADD(NOW(), INTERVAL :ttl SECOND)
+            WHERE exam_id = :eid AND user_id = :sid
+        """), {"eid": exam_id, "sid": user_id, "ttl": ttl}).rowcount
+        if refreshed:
+            metrics.incr("holds.extended")
+        else:
+            mine = db.session.execute(text("""
+                SELECT COUNT(*) AS active,
+                       IFNULL(SUM(exam_id = :eid), 0) AS this_exam
+                FROM Registrations
+                WHERE user_id = :sid AND status = 'Active'
+            """), {"eid": exam_id, "sid": user_id}).first()
+            if mine.this_exam:
+                return None, "registered"
+            if mine.active >= 3:
+                return None, "limit"
+            if exam.booked_count + exam.held_count >= exam.capacity:
+                metrics.incr("holds.rejected_full")
+                return None, "full"
+            db.session.execute(text("""
+                INSERT INTO SeatHolds (exam_id, user_id, expires_at)
+                VALUES (:eid, :sid, DATE_ADD(NOW(), INTERVAL :ttl SECOND))
+            """), {"eid": exam_id, "sid": user_id, "ttl": ttl})
+            _adjust_held_count(exam_id, +1)
+            metrics.incr("holds.placed")
+
+        expires_at = db.session.execute(text("""
+            SELECT expires_at FROM SeatHolds WHERE exam_id = :eid AND user_id = :sid
+        """), {"eid": exam_id, "sid": user_id}).scalar()
+        return expires_at, None
+
+    expires_at, reason = run_in_transaction(hold, route="seat_hold")
+    if expires_at is not None:
+        released = _release_other_holds(exam_id, user_id)
+        availability_hub.publish(seats_after_holds(exam_id, *released))
+    return expires_at, reason
+
+
+def consume_hold(exam_id: int, user_id: int) -> bool:
+    """Turn the student's hold into a booking; call under the exam row lock.
+
+    Returns True when a hold existed (its seat moves from held_count to the
+    caller's booked_count increment), False otherwise.
+    """
+    removed = db.session.execute(text("""
+        DELETE FROM SeatHolds WHERE exam_id = :eid AND user_id = :sid
+    """), {"eid": exam_id, "sid": user_id}).rowcount
+    if removed:
+        _adjust_held_count(exam_id, -removed)
+        metrics.incr("holds.converted")
+    return bool(removed)
+
+
+def release_hold(exam_id: int, user_id: int) -> bool:
+    """Give a held seat back (the student backed out of the review page)."""
+    removed = _release_locked(exam_id, user_id)
+    if removed:
+        metrics.incr("holds.released")
+        availability_hub.publish(seats_after_holds(exam_id))
+    return bool(removed)
+
+
+def seats_after_holds(*exam_ids: int) -> dict:
+    """Committed ``{exam_id: remaining}`` for hub updates after a hold change."""
+    changes = seats_remaining(*exam_ids) if exam_ids else {}
+    db.session.commit()
+    return changes
+
+
+def sweep_expired_holds(batch: int = None) -> int:
+    """Release expired holds, one exam per transaction, at most ``batch`` exams per pass.
+
+    Each exam's holds are deleted under that exam's row lock, taken before
+    any SeatHolds row, as every other hold path does; no transaction holds
+    two exam locks. Returns the number of holds released.
+    """
+    batch = batch or current_app.config["SEAT_HOLD_SWEEP_BATCH"]
+    released = 0
+    while True:
+        exam_ids = db.session.execute(text("""
+            SELECT DISTINCT exam_id FROM SeatHolds
+            WHERE expires_at <= NOW()
+            LIMIT :n
+        """), {"n": batch}).scalars().all()
+        db.session.commit()
+        if not exam_ids:
+            break
+
+        swept = []
+        for exam_id in exam_ids:
+            def sweep(exam_id=exam_id):
+                db.session.execute(text("""
+                    SELECT id FROM Exams WHERE id = :eid FOR UPDATE
+                """), {"eid": exam_id})
+                removed = db.session.execute(text("""
+                    DELETE FROM SeatHolds
+                    WHERE exam_id = :eid AND expires_at <= NOW()
+                """), {"eid": exam_id}).rowcount
+                _adjust_held_count(exam_id, -removed)
+                return removed
+
+            removed = run_in_transaction(sweep, route="seat_hold_sweep")
+            if removed:
+                released += removed
+                swept.append(exam_id)
+        if swept:
+            availability_hub.publish(seats_after_holds(*swept))
+        if len(exam_ids) < batch:
+            break
+
+    if released:
+        metrics.incr("holds.expired", released)
+    return released
+
+
+_sweeper_lock = threading.Lock()
+_sweeper_started = False
+
+
+def _sweep_forever(app):
+    interval = app.config["SEAT_HOLD_SWEEP_SECONDS"]
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                sweep_expired_holds()
+            except Exception as e:
+                db.session.rollback()
+                print("Seat hold sweep error:", e)
+            finally:
+                db.session.remove()
+
+
+def init_app(app):
+    """Start the per-worker sweeper thread with the first request (not for CLI runs)."""
+    if not app.config["SEAT_HOLD_SWEEPER"]:
+        return
+
+    @app.before_request
+    def _start_hold_sweeper():
+        global _sweeper_started
+        if _sweeper_started:
+            return
+        with _sweeper_lock:
+            if not _sweeper_started:
+                threading.Thread(target=_sweep_forever, args=(app,),
+                                 name="seat-hold-sweeper", daemon=True).start()
+                _sweeper_started = True
+
+
+@click.command("sweep-holds")
+@with_appcontext
+def sweep_holds_command():
+    """Release expired seat holds now."""
+    released = sweep_expired_holds()
+    click.echo(f"Released {released} expired seat hold(s).")
@@ -0,0 +1,50 @@
+# project/sqlite_store.py
+"""Base for the small host-local SQLite stores every worker shares.
+
+Used by the admission gate (admission.py) and the idempotency store
+(idempotency.py). Each thread gets its own autocommit connection to a WAL
+database, so readers never wait on the writer; ``_write(fn)`` runs
+``fn(conn)`` inside ``BEGIN IMMEDIATE``. gunicorn.conf.py calls
+``reset_connections`` after fork().
+"""
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    busy_timeout = 5  # seconds to wait for the write lock before OperationalError
+
+    def __init__(self):
+        self._local = threading.local()
+        self._path = None
+
+    def _open(self, path, schema):
+        self._path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema)
+
+    def reset_connections(self):
+        """Forget connections inherited across fork(); each process opens its own."""
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit mode; every state change is its own BEGIN IMMEDIATE
+            conn = sqlite3.connect(self._path, timeout=self.busy_timeout, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _write(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
@@ -0,0 +1,35 @@
+# project/startup.py
+"""Per-phase timing of ``create_app()``.
+
+Each phase's duration is logged once at INFO when the app is built, kept in
+``app.extensions["startup_ms"]`` and exported as the ``startup_ms`` gauge, so a
+slow worker spawn can be pinned on config, schema, blueprints or pool warm-up.
+``tools/bench_startup.py`` tracks the same numbers across commits.
+"""
+import logging
+import time
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, phase: str) -> None:
+        """Close ``phase``: the time since the previous mark is charged to it."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+    def finish(self, app) -> dict:
+        timings = dict(self.phases, total=round((self._last - self.started) * 1000, 2))
+        app.extensions["startup_ms"] = timings
+        metrics.register_gauge("startup_ms", lambda: timings)
+        log.info("create_app finished in %.1f ms: %s", timings["total"],
+                 ", ".join(f"{k}={v}" for k, v in self.phases.items()))
+        return timings
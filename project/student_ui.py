@@ -1,9 +1,24 @@
 # project/student_ui.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, jsonify,
+                   Response, current_app)
 from flask_login import login_required, current_user
 from sqlalchemy import text
 from project import db
-import random
+from . import metrics
+from .admission import admission_controlled, exam_id_from_payload
+from .availability_cache import availability_cache
+from .availability_hub import availability_hub
+from .confirmation_codes import code_allocator
+from .db_routing import mark_recent_write, read_execute
+from .fragment_cache import fragment_cache
+from .idempotency import idempotent
+from .pagination import decode_cursor, encode_cursor
+from .reference_data import ref_data
+from .seat_counter import adjust_booked_count, seats_remaining
+from .seat_holds import consume_hold, place_hold, release_hold
+from .txn_retry import lock_error_kind, run_in_transaction
+import json
+import time
 
 
 student_ui = Blueprint("student_ui", __name__)
@@ -13,66 +28,81 @@ student_ui = Blueprint("student_ui", __name__)
 def student_dashboard():
     return render_template("student_dashboard.html")
 
+# Hot statements are module-level so tools/check_query_plans.py EXPLAINs
+# exactly what the routes run.
+UPCOMING_EXAMS_SQL = """
+    SELECT
+        e.id AS exam_id,
+        e.exam_type AS course,
+        e.exam_date AS date,
+        e.exam_time AS time,                -- if you added this column; otherwise use NULL
+        e.location_id,
+        e.capacity,
+        e.booked_count,
+        GREATEST(e.capacity - e.booked_count - e.held_count, 0) AS remaining
+    FROM Exams e
+    WHERE e.exam_date >= CURDATE()
+    ORDER BY e.exam_date, e.exam_time, e.exam_type
+"""
+
 @student_ui.route("/student/exams", methods=["GET"])
 @login_required
+@admission_controlled()
 def student_exams():
-    rows = db.session.execute(text("""
-        SELECT
-            e.id AS exam_id,
-            e.exam_type AS course,
-            e.exam_date AS date,
-            e.exam_time AS time,                -- if you added this column; otherwise use NULL
-            l.name AS location,
-            e.capacity,
-            IFNULL(SUM(CASE WHEN r.status = 'Active' THEN 1 ELSE 0 END), 0) AS booked_count,
-            GREATEST(e.capacity - IFNULL(SUM(CASE WHEN r.status = 'Active' THEN 1 ELSE 0 END), 0), 0) AS remaining
-        FROM Exams e
-        LEFT JOIN Locations l    ON l.id = e.location_id                           
-        LEFT JOIN Registrations r ON r.exam_id = e.id
-        WHERE e.exam_date >= CURDATE()
-        GROUP BY e.id, e.exam_type, e.exam_date, e.exam_time, l.name, e.capacity
-        ORDER BY e.exam_date, e.exam_time, e.exam_type
-    """)).mappings().all()
-
-    exams = [dict(r) for r in rows]
+    rows = read_execute(text(UPCOMING_EXAMS_SQL)).mappings().all()
+
+    # location names come from the reference cache instead of a join; each
+    # row's HTML is reused until one of the values it shows changes
+    locations = ref_data().locations
+    exams = []
+    for r in rows:
+        e = dict(r, location=locations.name_of(r["location_id"]))
+        signature = (e["course"], e["date"], e["time"], e["location"], e["remaining"])
+        e["row_html"] = fragment_cache.render("partials/exam_row.html", e["exam_id"], signature, e=e)
+        exams.append(e)
 
     return render_template("schedule_exam.html", exams=exams)
 
 
-@student_ui.route("/student/appointments", methods=["GET"])
-@login_required
-def student_appointments():
-    q      = (request.args.get("q") or "").strip()
-    start  = (request.args.get("start") or "").strip()  # YYYY-MM-DD
-    end    = (request.args.get("end") or "").strip()    # YYYY-MM-DD
-
-    sql = """
-        SELECT
-            r.id                     AS reg_id,
-            r.registration_id        AS confirmation_code,
-            r.status                 AS status,
-            e.id                     AS exam_id,
-            e.exam_type              AS exam_type,
-            e.exam_date              AS exam_date,
-            e.exam_time              AS exam_time,
-            c.course_code            AS course_code,
-            l.name                   AS location
-        FROM Registrations r
-        JOIN Exams       e ON e.id  = r.exam_id
-        JOIN Courses     c ON c.id  = e.course_id
-        LEFT JOIN Locations l ON l.id = e.location_id
-        WHERE r.user_id = :sid
-          /* optional filters */
-          {name_filter}
-          {start_filter}
-          {end_filter}
-        ORDER BY e.exam_date DESC, e.exam_time DESC, c.course_code
-    """
-
+APPOINTMENTS_PAGE_SIZE = 25
+
+# One statement per page view: the upcoming/past split is computed against
+# the database clock in the same SELECT, and history is paged newest-first
+# by (exam_date, exam_time, id) so older bookings are never loaded up front.
+APPOINTMENTS_SQL = """
+    SELECT
+        r.id                     AS reg_id,
+        r.registration_id        AS confirmation_code,
+        r.status                 AS status,
+        e.id                     AS exam_id,
+        e.exam_type              AS exam_type,
+        e.exam_date              AS exam_date,
+        e.exam_time              AS exam_time,
+        CAST(COALESCE(e.exam_time, '00:00:00') AS TIME) AS sort_time,
+        (e.exam_date >= CURDATE()) AS is_upcoming,
+        c.course_code            AS course_code,
+        l.name                   AS location
+    FROM Registrations r
+    JOIN Exams       e ON e.id  = r.exam_id
+    JOIN Courses     c ON c.id  = e.course_id
+    LEFT JOIN Locations l ON l.id = e.location_id
+    WHERE r.user_id = :sid
+      /* optional filters */
+      {name_filter}
+      {start_filter}
+      {end_filter}
+      {cursor_filter}
+    ORDER BY e.exam_date DESC, sort_time DESC, r.id DESC
+    LIMIT :limit
+"""
+
+def appointments_sql(user_id, q="", start="", end="", position=None):
+    """One page of a student's bookings; ``position`` is a decoded keyset cursor."""
     name_filter = ""
     start_filter = ""
     end_filter = ""
-    params = {"sid": current_user.id}
+    cursor_filter = ""
+    params = {"sid": user_id, "limit": APPOINTMENTS_PAGE_SIZE + 1}
 
     if q:
         name_filter = "AND (c.course_code LIKE :like OR e.exam_type LIKE :like)"
@@ -86,23 +116,47 @@ def student_appointments():
         end_filter = "AND e.exam_date <= :end"
         params["end"] = end
 
-    sql = sql.format(
+    if position:
+        cursor_filter = ("AND (e.exam_date, CAST(COALESCE(e.exam_time, '00:00:00') AS TIME), r.id)"
+                         " < (:c_date, :c_time, :c_id)")
+        params.update(c_date=position[0], c_time=position[1], c_id=position[2])
+
+    sql = APPOINTMENTS_SQL.format(
         name_filter=name_filter,
         start_filter=start_filter,
-        end_filter=end_filter
+        end_filter=end_filter,
+        cursor_filter=cursor_filter
     )
+    return text(sql), params
+
+@student_ui.route("/student/appointments", methods=["GET"])
+@login_required
+def student_appointments():
+    q      = (request.args.get("q") or "").strip()
+    start  = (request.args.get("start") or "").strip()  # YYYY-MM-DD
+    end    = (request.args.get("end") or "").strip()    # YYYY-MM-DD
+    after  = (request.args.get("after") or "").strip()  # keyset cursor from the previous page
 
-    rows = db.session.execute(text(sql), params).mappings().all()
-    bookings = [dict(r) for r in rows]
+    position = decode_cursor(after, 3) if after else None
+    query, params = appointments_sql(current_user.id, q, start, end, position)
+
+    rows = db.session.execute(query, params).mappings().all()
+    bookings = [dict(r) for r in rows[:APPOINTMENTS_PAGE_SIZE]]
+    next_cursor = None
+    if len(rows) > APPOINTMENTS_PAGE_SIZE:
+        last = bookings[-1]
+        next_cursor = encode_cursor(last["exam_date"], last["sort_time"], last["reg_id"])
 
     # Split upcoming vs past (handy for headings in the template)
-    upcoming = [b for b in bookings if str(b["exam_date"]) >= str(db.session.execute(text("SELECT CURDATE()")).scalar())]
-    past     = [b for b in bookings if str(b["exam_date"]) <  str(db.session.execute(text("SELECT CURDATE()")).scalar())]
+    upcoming = [b for b in bookings if b["is_upcoming"]]
+    past     = [b for b in bookings if not b["is_upcoming"]]
 
     return render_template("appointments.html",
                            bookings=bookings,
                            upcoming=upcoming,
                            past=past,
+                           next_cursor=next_cursor,
+                           paged=bool(position),
                            q=q, start=start, end=end)
 
 
@@ -111,46 +165,45 @@ def student_appointments():
 # --------------------------
 # Validation / helper fns
 # --------------------------
-def has_reached_limit(student_id: int) -> bool:
-    q = text("""
-        SELECT COUNT(*) AS cnt
-        FROM Registrations
-        WHERE user_id = :sid
-          AND status = 'Active'
-    """)
-    cnt = db.session.execute(q, {"sid": student_id}).scalar() or 0
-    return cnt >= 3
-
-def already_registered(student_id: int, exam_id: int) -> bool:
-    q = text("""
-        SELECT 1
-        FROM Registrations
-        WHERE user_id = :sid
-          AND exam_id = :eid
-          AND status = 'Active'
-        LIMIT 1
-    """)
-    row = db.session.execute(q, {"sid": student_id, "eid": exam_id}).first()
-    return row is not None
-
 def exam_availability_snapshot():
     """Return list of dicts: {exam_id, capacity, booked_count, remaining}"""
     rows = db.session.execute(text("""
         SELECT
             e.id AS exam_id,
             e.capacity,
-            IFNULL(SUM(CASE WHEN r.status='Active' THEN 1 ELSE 0 END), 0) AS booked_count,
-            GREATEST(e.capacity - IFNULL(SUM(CASE WHEN r.status='Active' THEN 1 ELSE 0 END), 0), 0) AS remaining
+            e.booked_count,
+            GREATEST(e.capacity - e.booked_count - e.held_count, 0) AS remaining
         FROM Exams e
-        LEFT JOIN Registrations r ON r.exam_id = e.id
-        GROUP BY e.id, e.capacity
         ORDER BY e.id
     """)).mappings().all()
     return [dict(r) for r in rows]
 
 
+# Shown when a booking transaction is still losing lock races after its retries
+BUSY_MESSAGE = "Too many students are booking right now. Please try again in a moment."
+
+def _record_lock_timing(exam_id, wait_started, locked_at):
+    """Per-exam time spent waiting for the exam row lock and holding it."""
+    now = time.perf_counter()
+    metrics.observe("booking.lock_wait_ms", (locked_at - wait_started) * 1000, f"exam:{exam_id}")
+    metrics.observe("booking.lock_hold_ms", (now - locked_at) * 1000, f"exam:{exam_id}")
+
+
+# The student's Active bookings: the 3-booking limit and the duplicate check
+# in one covered index read (locking, so it sees every committed booking
+# rather than the transaction's snapshot)
+ACTIVE_BOOKINGS_SQL = """
+    SELECT COUNT(*) AS active,
+           IFNULL(SUM(exam_id = :eid), 0) AS this_exam
+    FROM Registrations
+    WHERE user_id = :sid AND status = 'Active'
+    FOR UPDATE
+"""
+
 @student_ui.route("/student/register_exam", methods=["POST"])
 @login_required
+@idempotent
+@admission_controlled(exam_id_from_payload)
 def register_exam():   ##  confirm
     payload = request.get_json(silent=True) if request.is_json else request.form
     exam_id = payload.get("exam_id")
@@ -165,75 +218,78 @@ def register_exam():   ##  confirm
 
     sid = int(current_user.id)
 
-    # fast-fails (rechecked in txn)
-    if has_reached_limit(sid):
-        msg = "You already have 3 active registrations."
-        return (jsonify({"ok": False, "error": msg}), 400) if request.is_json else (
-            flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-        )
-    if already_registered(sid, exam_id):
-        msg = "You are already registered for this exam."
-        return (jsonify({"ok": False, "error": msg}), 400) if request.is_json else (
-            flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-        )
+    def book():
+        """Returns (reject, seat_changes, wait_started, locked_at); rerun on lock errors."""
+        # One locking read takes the exam row (serialises seats for this
+        # session) and the student's row (serialises this student's bookings,
+        # so two concurrent requests can't both become booking #3).
+        wait_started = time.perf_counter()
+        exam = db.session.execute(text("""
+            SELECT e.capacity, e.booked_count, e.held_count
+            FROM Exams e
+            JOIN Users u ON u.id = :sid
+            WHERE e.id = :eid
+            FOR UPDATE
+        """), {"eid": exam_id, "sid": sid}).first()
+        locked_at = time.perf_counter()
+
+        if not exam:
+            return ("Exam not found.", 404), {}, wait_started, locked_at
+
+        mine = db.session.execute(text(ACTIVE_BOOKINGS_SQL),
+                                  {"eid": exam_id, "sid": sid}).first()
+
+        taken = exam.booked_count + exam.held_count
+        if mine.this_exam:
+            reject = ("You are already registered for this exam.", 400)
+        elif mine.active >= 3:
+            reject = ("You already have 3 active registrations.", 400)
+        elif consume_hold(exam_id, sid):
+            # the seat was reserved on the review page: it moves from
+            # held_count to booked_count, no capacity check
+            reject = None
+        elif taken >= exam.capacity:
+            # both counters are maintained under this same row lock
+            reject = ("This session is full.", 409)
+        else:
+            reject = None
+            taken += 1
+        if not reject:
+            # a previously cancelled booking for this exam is re-activated in
+            # place (UNIQUE(exam_id, user_id)); only otherwise a new row. No
+            # upsert: that would also fire on a registration_id collision and
+            # rewrite another student's row instead of failing.
+            reactivated = db.session.execute(text("""
+                UPDATE Registrations
+                SET status = 'Active', registration_id = :code, registration_date = NOW()
+                WHERE exam_id = :eid AND user_id = :sid AND status = 'Canceled'
+            """), {"code": confirmation_code, "eid": exam_id, "sid": sid}).rowcount
+            if not reactivated:
+                db.session.execute(text("""
+                    INSERT INTO Registrations
+                        (registration_id, exam_id, user_id, registration_date, status)
+                    VALUES
+                        (:code, :eid, :sid, NOW(), 'Active')
+                """), {"code": confirmation_code, "eid": exam_id, "sid": sid})
+            adjust_booked_count(exam_id, +1)
+            seat_changes = {exam_id: max(exam.capacity - taken, 0)}
+            return None, seat_changes, wait_started, locked_at
+        return reject, {}, wait_started, locked_at
 
     try:
-        with db.session.begin():
-            # lock target exam
-            exam = db.session.execute(text("""
-                SELECT id, capacity
-                FROM Exams
-                WHERE id = :eid
-                FOR UPDATE
-            """), {"eid": exam_id}).first()
-            if not exam:
-                msg = "Exam not found."
-                return (jsonify({"ok": False, "error": msg}), 404) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            # re-check limits inside txn
-            if has_reached_limit(sid):
-                msg = "You already have 3 active registrations."
-                return (jsonify({"ok": False, "error": msg}), 400) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-            if already_registered(sid, exam_id):
-                msg = "You are already registered for this exam."
-                return (jsonify({"ok": False, "error": msg}), 400) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            # capacity guard using live count of Active regs (row-locked)
-            active = db.session.execute(text("""
-                SELECT COUNT(*) FROM Registrations
-                WHERE exam_id = :eid AND status = 'Active'
-                FOR UPDATE
-            """), {"eid": exam_id}).scalar() or 0
-
-            if int(active) >= int(exam.capacity):
-                msg = "This session is full."
-                return (jsonify({"ok": False, "error": msg}), 409) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            # insert registration with CSN code
-            # suffix = (exam_id + random.randint(100, 999)) % 1000
-            # confirmation_code = f"CSN{suffix:03d}"
-
-            db.session.execute(text("""
-                INSERT INTO Registrations
-                    (registration_id, exam_id, user_id, registration_date, status)
-                VALUES
-                    (NULL, :eid, :sid, NOW(), 'Active')
-            """), {"eid": exam_id, "sid": sid})
-
-            new_id = db.session.execute(text("SELECT LAST_INSERT_ID()")).scalar()
-            confirmation_code = db.session.execute(text("""
-                SELECT registration_id
-                FROM Registrations
-                WHERE id = :rid
-            """), {"rid": new_id}).scalar()
+        # Allocated before any lock is taken; block refills run in their own txn.
+        confirmation_code = code_allocator.next_code()
+        reject, seat_changes, wait_started, locked_at = run_in_transaction(book)
+        _record_lock_timing(exam_id, wait_started, locked_at)
+
+        if reject:
+            msg, status = reject
+            return (jsonify({"ok": False, "error": msg}), status) if request.is_json else (
+                flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
+            )
+
+        availability_hub.publish(seat_changes)
+        mark_recent_write()
 
         # JSON → include Location header
         if request.is_json:
@@ -248,8 +304,9 @@ def register_exam():   ##  confirm
     except Exception as e:
         db.session.rollback()
         print("Register Error:", e)
-        err = "Registration failed. Please try again."
-        return (jsonify({"ok": False, "error": err}), 500) if request.is_json else (
+        busy = lock_error_kind(e) is not None
+        err = BUSY_MESSAGE if busy else "Registration failed. Please try again."
+        return (jsonify({"ok": False, "error": err}), 503 if busy else 500) if request.is_json else (
             flash(err, "error") or redirect(url_for("student_ui.student_appointments"))
         )
 
@@ -257,25 +314,37 @@ def register_exam():   ##  confirm
 
 @student_ui.route("/student/cancel_exam/<int:exam_id>", methods=["POST"])
 @login_required
+@idempotent
+@admission_controlled(lambda kwargs: kwargs["exam_id"])
 def cancel_exam(exam_id):
+    def cancel():
+        changed = db.session.execute(text("""
+            UPDATE Registrations
+            SET status = 'Canceled'
+            WHERE exam_id = :eid AND user_id = :sid
+              AND status = 'Active'
+        """), {
+            "eid": exam_id,
+            "sid": current_user.id
+        }).rowcount
+        adjust_booked_count(exam_id, -changed)
+        return changed, (seats_remaining(exam_id) if changed else {})
+
     try:
-        with db.session.begin():
-            cancel_q = text("""
-                UPDATE Registrations
-                SET status = 'Canceled'
-                WHERE exam_id = :eid AND user_id = :sid
-                  AND status = 'Active'
-            """)
-            changed = db.session.execute(cancel_q, {
-                "eid": exam_id,
-                "sid": current_user.id
-            }).rowcount
+        changed, seat_changes = run_in_transaction(cancel)
+        availability_hub.publish(seat_changes)
+        mark_recent_write()
         if request.is_json:
             return jsonify({"ok": True, "changed": changed}), 200
         flash("Exam cancelled successfully!", "success")
     except Exception as e:
         db.session.rollback()
         print("Cancel Error:", e)
+        if lock_error_kind(e):
+            if request.is_json:
+                return jsonify({"ok": False, "error": BUSY_MESSAGE}), 503
+            flash(BUSY_MESSAGE, "error")
+            return redirect(url_for("student_ui.student_appointments"))
         if request.is_json:
             return jsonify({"ok": False, "error": "Error cancelling exam."}), 500
         flash("Error cancelling exam. Please try again.", "error")
@@ -302,6 +371,8 @@ def confirm_page(code):
 
 @student_ui.route("/student/reschedule", methods=["POST"])
 @login_required
+@idempotent
+@admission_controlled(exam_id_from_payload)
 def reschedule_exam():
     payload = request.get_json(silent=True) if request.is_json else request.form
     reg_id      = payload.get("registration_id")
@@ -315,60 +386,66 @@ def reschedule_exam():
             flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
         )
 
+    def move():
+        """Returns (reject, seat_changes); reject is (message, status) or None."""
+        reg = db.session.execute(text("""
+            SELECT id, exam_id
+            FROM Registrations
+            WHERE id = :rid AND user_id = :sid AND status = 'Active'
+            FOR UPDATE
+        """), {"rid": reg_id, "sid": current_user.id}).first()
+        if not reg:
+            return ("Active registration not found.", 404), {}
+
+        old_exam_id = int(reg.exam_id)
+        if old_exam_id == new_exam_id:
+            return None, None
+
+        # lock both exams in stable order
+        first_id, second_id = sorted([old_exam_id, new_exam_id])
+        exams = db.session.execute(text("""
+            SELECT id, capacity, booked_count, held_count
+            FROM Exams
+            WHERE id IN (:a, :b)
+            FOR UPDATE
+        """), {"a": first_id, "b": second_id}).fetchall()
+        exams = {int(x.id): x for x in exams}
+        if new_exam_id not in exams or old_exam_id not in exams:
+            return ("Exam session not found.", 404), {}
+
+        # capacity guard on target, same as book(): a hold the student took
+        # on the review page is their seat; otherwise both counters count
+        target = exams[new_exam_id]
+        if (not consume_hold(new_exam_id, int(current_user.id))
+                and target.booked_count + target.held_count >= target.capacity):
+            return ("Target session is full.", 409), {}
+
+        # move the registration
+        db.session.execute(text("""
+            UPDATE Registrations
+            SET exam_id = :new_eid
+            WHERE id = :rid
+        """), {"new_eid": new_exam_id, "rid": reg_id})
+        adjust_booked_count(old_exam_id, -1)
+        adjust_booked_count(new_exam_id, +1)
+        return None, seats_remaining(old_exam_id, new_exam_id)
+
     try:
-        with db.session.begin():
-            reg = db.session.execute(text("""
-                SELECT id, exam_id
-                FROM Registrations
-                WHERE id = :rid AND user_id = :sid AND status = 'Active'
-                FOR UPDATE
-            """), {"rid": reg_id, "sid": current_user.id}).first()
-            if not reg:
-                msg = "Active registration not found."
-                return (jsonify({"ok": False, "error": msg}), 404) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            old_exam_id = int(reg.exam_id)
-            if old_exam_id == new_exam_id:
-                if request.is_json:
-                    return jsonify({"ok": True, "message": "No change."}), 200
-                flash("No change to session.", "info")
-                return redirect(url_for("student_ui.student_appointments"))
-
-            # lock both exams in stable order
-            first_id, second_id = sorted([old_exam_id, new_exam_id])
-            exams = db.session.execute(text("""
-                SELECT id, capacity
-                FROM Exams
-                WHERE id IN (:a, :b)
-                FOR UPDATE
-            """), {"a": first_id, "b": second_id}).fetchall()
-            have = {int(x.id): int(x.capacity) for x in exams}
-            if new_exam_id not in have or old_exam_id not in have:
-                msg = "Exam session not found."
-                return (jsonify({"ok": False, "error": msg}), 404) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            # capacity guard on target
-            active = db.session.execute(text("""
-                SELECT COUNT(*) FROM Registrations
-                WHERE exam_id = :eid AND status = 'Active'
-                FOR UPDATE
-            """), {"eid": new_exam_id}).scalar() or 0
-            if int(active) >= have[new_exam_id]:
-                msg = "Target session is full."
-                return (jsonify({"ok": False, "error": msg}), 409) if request.is_json else (
-                    flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
-                )
-
-            # move the registration
-            db.session.execute(text("""
-                UPDATE Registrations
-                SET exam_id = :new_eid
-                WHERE id = :rid
-            """), {"new_eid": new_exam_id, "rid": reg_id})
+        reject, seat_changes = run_in_transaction(move)
+
+        if reject:
+            msg, status = reject
+            return (jsonify({"ok": False, "error": msg}), status) if request.is_json else (
+                flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
+            )
+        if seat_changes is None:
+            if request.is_json:
+                return jsonify({"ok": True, "message": "No change."}), 200
+            flash("No change to session.", "info")
+            return redirect(url_for("student_ui.student_appointments"))
+
+        availability_hub.publish(seat_changes)
+        mark_recent_write()
 
         if request.is_json:
             return jsonify({"ok": True}), 200
@@ -378,46 +455,144 @@ def reschedule_exam():
     except Exception as e:
         db.session.rollback()
         print("Reschedule Error:", e)
-        msg = "Reschedule failed. Please try again."
-        return (jsonify({"ok": False, "error": msg}), 500) if request.is_json else (
+        busy = lock_error_kind(e) is not None
+        msg = BUSY_MESSAGE if busy else "Reschedule failed. Please try again."
+        return (jsonify({"ok": False, "error": msg}), 503 if busy else 500) if request.is_json else (
             flash(msg, "error") or redirect(url_for("student_ui.student_appointments"))
         )
 
 
+AVAILABILITY_SQL = """
+    SELECT
+        e.id AS exam_id,
+        GREATEST(e.capacity - e.booked_count - e.held_count, 0) AS remaining
+    FROM Exams e
+    WHERE e.exam_date >= CURDATE()
+    ORDER BY e.id
+"""
+
 @student_ui.route("/api/exams/availability", methods=["GET"])
 @login_required
 def api_exam_availability():
-    rows = db.session.execute(text("""
-        SELECT
-            e.id AS exam_id,
-            GREATEST(
-                e.capacity - IFNULL(SUM(CASE WHEN r.status='Active' THEN 1 ELSE 0 END), 0),
-                0
-            ) AS remaining
-        FROM Exams e
-        LEFT JOIN Registrations r ON r.exam_id = e.id
-        WHERE e.exam_date >= CURDATE()
-        GROUP BY e.id, e.capacity
-    """)).mappings().all()
-    return jsonify({"ok": True, "exams": [dict(r) for r in rows]})
+    metrics.incr("availability.requests")
+    version = availability_hub.version
+    entry = availability_cache.get(version)
+    if entry is not None:
+        metrics.incr("availability.cache_hit")
+    else:
+        metrics.incr("availability.cache_miss")
+        rows = read_execute(text(AVAILABILITY_SQL)).mappings().all()
+        body = json.dumps({"ok": True, "exams": [dict(r) for r in rows]})
+        entry = availability_cache.put(version, body, current_app.config["AVAILABILITY_CACHE_TTL"])
+
+    # weak comparison: the compression layer weakens the ETag on gzip/br bodies
+    if request.if_none_match.contains_weak(entry.etag):
+        metrics.incr("availability.not_modified")
+        resp = Response(status=304)
+    else:
+        resp = Response(entry.body, mimetype="application/json")
+    resp.set_etag(entry.etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+# Seconds between keep-alive comments, and how long one stream is held open
+# before the browser is told to reconnect (frees the worker thread).
+STREAM_KEEPALIVE_SECONDS = 20
+STREAM_MAX_SECONDS = 30 * 60
+
+@student_ui.route("/api/exams/availability/stream", methods=["GET"])
+@login_required
+def api_exam_availability_stream():
+    """Server-sent events carrying only the exams whose `remaining` changed."""
+    # Each open stream parks a worker thread; past the cap the page keeps
+    # just its conditional poll instead of starving login and booking.
+    sub = availability_hub.subscribe(request.headers.get("Last-Event-ID"),
+                                     limit=current_app.config["AVAILABILITY_MAX_STREAMS"])
+    if sub is None:
+        metrics.incr("availability.stream_rejected")
+        resp = Response("Too many open streams; polling instead.\n", status=503,
+                        mimetype="text/plain")
+        resp.headers["Retry-After"] = str(STREAM_KEEPALIVE_SECONDS)
+        return resp
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            deadline = time.monotonic() + STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                changes = sub.wait(STREAM_KEEPALIVE_SECONDS)
+                if not changes:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps({"exams": [
+                    {"exam_id": eid, "remaining": left} for eid, left in changes.items()
+                ]})
+                yield (f"id: {availability_hub.event_id(sub.last_seq)}\n"
+                       f"event: availability\ndata: {payload}\n\n")
+        finally:
+            sub.close()
+
+    # No stream_with_context: the request (and its DB session) is torn down
+    # before the first event, so a parked stream holds no connection.
+    resp = Response(events(), mimetype="text/event-stream")
+    # also frees the slot when the body is never iterated (client gone early)
+    resp.call_on_close(sub.close)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+HOLD_REJECTIONS = {
+    "full": "This session is full.",
+    "registered": "You are already registered for this exam.",
+    "limit": "You already have 3 active registrations.",
+}
 
 @student_ui.route("/student/register_review/<int:exam_id>", methods=["GET"])
 @login_required
+@admission_controlled(lambda kwargs: kwargs["exam_id"])
 def register_review(exam_id):
-    exam = db.session.execute(text("""
+    row = read_execute(text("""
         SELECT e.id AS exam_id, e.exam_type, e.exam_date, e.exam_time,
-               l.name AS location, c.course_code, c.course_name
+               e.location_id, e.course_id
         FROM Exams e
-        JOIN Courses c   ON c.id = e.course_id
-        LEFT JOIN Locations l ON l.id = e.location_id
         WHERE e.id = :eid
     """), {"eid": exam_id}).mappings().first()
+    refs = ref_data()
+    course = refs.courses.get(row["course_id"]) if row else None
 
-    if not exam:
+    if not course:
         flash("Exam not found.", "error")
         return redirect(url_for("student_ui.student_exams"))
 
-    return render_template("register_review.html", exam=exam)
+    exam = dict(row, location=refs.locations.name_of(row["location_id"]),
+                course_code=course.course_code, course_name=course.course_name)
+
+    # Reserve the seat while the student reviews, so confirming can't lose it
+    try:
+        hold_expires, reason = place_hold(exam_id, int(current_user.id))
+    except Exception as e:
+        db.session.rollback()
+        print("Seat Hold Error:", e)
+        hold_expires, reason = None, None
+    if reason in HOLD_REJECTIONS:
+        flash(HOLD_REJECTIONS[reason], "error")
+        return redirect(url_for("student_ui.student_exams"))
+
+    return render_template("register_review.html", exam=exam, hold_expires=hold_expires)
+
+
+@student_ui.route("/student/register_review/<int:exam_id>/release", methods=["POST"])
+@login_required
+def release_review_hold(exam_id):
+    try:
+        release_hold(exam_id, int(current_user.id))
+    except Exception as e:
+        db.session.rollback()
+        print("Seat Hold Release Error:", e)
+    if request.is_json:
+        return jsonify({"ok": True}), 200
+    return redirect(url_for("student_ui.student_exams"))
 
 
 # ==========================================================
@@ -0,0 +1,81 @@
+# project/txn_retry.py
+"""Retry booking transactions that lose a lock race.
+
+MySQL answers lock contention with two errors that are safe to retry from
+the top of the transaction: 1213 (deadlock, the transaction was rolled back)
+and 1205 (lock wait timeout). ``run_in_transaction`` reruns the whole
+transaction body on either, with jittered exponential backoff, until the
+attempt count or the time budget runs out. Anything else propagates at once.
+
+Retries are counted per route in metrics: ``txn.retry.<route>``,
+``txn.deadlock.<route>``, ``txn.lock_timeout.<route>`` and
+``txn.retry_exhausted.<route>``, plus a ``txn.retry_wait_ms`` histogram.
+"""
+import random
+import time
+
+from flask import current_app, request
+from sqlalchemy.exc import DBAPIError
+
+from . import db, metrics
+
+DEADLOCK = 1213
+LOCK_WAIT_TIMEOUT = 1205
+_KINDS = {DEADLOCK: "deadlock", LOCK_WAIT_TIMEOUT: "lock_timeout"}
+
+
+def lock_error_kind(exc):
+    """``"deadlock"`` / ``"lock_timeout"`` for a retryable lock error, else None."""
+    if not isinstance(exc, DBAPIError) or exc.orig is None:
+        return None
+    args = getattr(exc.orig, "args", ())
+    return _KINDS.get(args[0]) if args else None
+
+
+def fresh_transaction():
+    """``db.session.begin()`` for a booking transaction.
+
+    Earlier reads in the request (Flask-Login's user_loader, for one) leave an
+    implicit transaction open, and ``begin()`` refuses to nest inside it.
+    """
+    if db.session().in_transaction():
+        db.session.commit()
+    return db.session.begin()
+
+
+def backoff_delay(attempt: int, base_ms: float, cap_ms: float) -> float:
+    """Full-jitter exponential backoff, in seconds, before retry ``attempt`` (1-based)."""
+    return random.uniform(0, min(cap_ms, base_ms * (2 ** (attempt - 1)))) / 1000
+
+
+def run_in_transaction(body, route=None):
+    """Run ``body()`` in a fresh transaction, retrying on deadlock / lock timeout.
+
+    ``body`` must be safe to run again from scratch: everything it does goes
+    through ``db.session`` and is rolled back before a retry. Returns whatever
+    ``body`` returns; re-raises the last error when the budget is spent.
+    """
+    cfg = current_app.config
+    route = route or request.endpoint or "unknown"
+    attempts = cfg["TXN_RETRY_ATTEMPTS"]
+    deadline = time.monotonic() + cfg["TXN_RETRY_BUDGET_MS"] / 1000
+
+    attempt = 1
+    while True:
+        try:
+            with fresh_transaction():
+                return body()
+        except DBAPIError as e:
+            db.session.rollback()
+            kind = lock_error_kind(e)
+            if kind is None:
+                raise
+            metrics.incr(f"txn.{kind}.{route}")
+            delay = backoff_delay(attempt, cfg["TXN_RETRY_BASE_MS"], cfg["TXN_RETRY_MAX_MS"])
+            if attempt >= attempts or time.monotonic() + delay > deadline:
+                metrics.incr(f"txn.retry_exhausted.{route}")
+                raise
+            metrics.incr(f"txn.retry.{route}")
+            metrics.observe("txn.retry_wait_ms", delay * 1000, route)
+            time.sleep(delay)
+            attempt += 1
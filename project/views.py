@@ -1,9 +1,8 @@
-print(">>> LOADED: views.py blueprint <<<")
-
 from flask import Blueprint, render_template, jsonify, current_app, redirect, url_for, request, flash
 from flask_login import login_required, current_user
-from . import db
+from . import db, metrics
 from sqlalchemy import text
+import functools
 import os
 import time
 import logging
@@ -61,27 +60,36 @@ def alive():
     return f"UPDATED: {int(time.time())}", 200
 
 
+@bp.route('/__metrics')
+def metrics_view():
+    # Per-process counters (cache hits, 304s, ...) for a local scraper or faculty.
+    # Off unless METRICS_ENDPOINT is set (default: on in development only).
+    if not current_app.config['METRICS_ENDPOINT']:
+        return jsonify({'error': 'not found'}), 404
+    local = request.remote_addr in ('127.0.0.1', '::1')
+    faculty = getattr(getattr(current_user, 'role', None), 'name', '').lower() == 'faculty'
+    if not (local or faculty):
+        return jsonify({'error': 'forbidden'}), 403
+    return jsonify(metrics.snapshot())
+
+
+@functools.lru_cache(maxsize=8)
+def _static_text(filename):
+    """A static text file's contents, read once per worker ('' if missing)."""
+    try:
+        with open(os.path.join(os.path.dirname(__file__), 'static', filename), 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+
 @bp.route('/preview')
 def preview():
     """Return a standalone HTML page with inlined CSS from style.css to force-show the background.
     This bypasses template rendering and helps confirm the latest styles in the browser.
     """
-    css_path = os.path.join(os.path.dirname(__file__), 'static', 'css', 'style.css')
-    bg_css_path = os.path.join(os.path.dirname(__file__), 'static', 'css', 'backgrounds.css')
-
-    css = ''
-    bg_css = ''
-    try:
-        with open(css_path, 'r', encoding='utf-8') as f:
-            css = f.read()
-    except Exception:
-        css = ''
-
-    try:
-        with open(bg_css_path, 'r', encoding='utf-8') as f:
-            bg_css = f.read()
-    except Exception:
-        bg_css = ''
+    css = _static_text('css/style.css')
+    bg_css = _static_text('css/backgrounds.css')
 
     # Inline both the main CSS and the background preview CSS for a single preview page
     html = f"""
@@ -1,8 +1,12 @@
+import os
+
 from project import create_app
 
 # Create the Flask app using your factory
 app = create_app()
 
 if __name__ == "__main__":
-    # Enable debug mode so changes reload automatically
-    app.run(debug=True, host="127.0.0.1", port=5000)
+    # Local development server only (single process). Production runs
+    # `gunicorn -c gunicorn.conf.py wsgi:app`; FLASK_DEBUG=1 turns on the
+    # reloader and debugger here.
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", host="127.0.0.1", port=5000)
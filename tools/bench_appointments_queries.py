@@ -0,0 +1,118 @@
+"""Regression benchmark: /student/appointments must issue a constant number of
+SQL statements no matter how long a student's booking history is.
+
+Runs against the database configured in .env. It creates a throwaway student
+plus one exam/registration per history entry, renders the page for each
+history size, and removes everything it created afterwards.
+
+    python tools/bench_appointments_queries.py --sizes 1 10 40 200
+
+Exits non-zero if the statement count changes with history size.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import current_app
+from flask_login import login_user
+from sqlalchemy import event, text
+
+from project import create_app, db
+from project.confirmation_codes import code_allocator, format_code, permute
+from project.models import User
+
+
+def _seed_student(history):
+    """Insert a student with ``history`` registrations; returns (user_id, exam_ids)."""
+    ref = db.session.execute(text("""
+        SELECT (SELECT id FROM Courses ORDER BY id LIMIT 1)   AS course_id,
+               (SELECT id FROM Locations ORDER BY id LIMIT 1) AS location_id,
+               (SELECT id FROM Buildings ORDER BY id LIMIT 1) AS building_id,
+               (SELECT id FROM Roles WHERE LOWER(name) = 'student' LIMIT 1) AS role_id
+    """)).first()
+    nshe = str(uuid.uuid4().int)[:10]
+    user_id = db.session.execute(text("""
+        INSERT INTO Users (name, email, phone, nshe_id, password_hash, role_id)
+        VALUES ('Bench Student', :email, '000-000-0000', :nshe, '!', :role)
+    """), {"email": f"{nshe}@student.csn.edu", "nshe": nshe, "role": ref.role_id}).lastrowid
+
+    exam_ids = []
+    for i in range(history):
+        exam_ids.append(db.session.execute(text("""
+            INSERT INTO Exams (exam_type, course_id, exam_date, location_id, building_id, capacity)
+            VALUES ('Bench Exam', :course, DATE_ADD(CURDATE(), INTERVAL :offset DAY),
+                    :loc, :bld, 20)
+        """), {"course": ref.course_id, "offset": i - history // 2,
+               "loc": ref.location_id, "bld": ref.building_id}).lastrowid)
+    # codes come from the app allocator, as for real bookings (no id trigger)
+    start_seq, _ = code_allocator.reserve_block(max(history, 1))
+    key = current_app.config["CONFIRMATION_CODE_KEY"].encode()
+    for n, exam_id in enumerate(exam_ids):
+        db.session.execute(text("""
+            INSERT INTO Registrations (registration_id, exam_id, user_id, status)
+            VALUES (:code, :eid, :sid, 'Active')
+        """), {"code": format_code(permute(start_seq + n, key)), "eid": exam_id, "sid": user_id})
+    db.session.commit()
+    return user_id, exam_ids
+
+
+def _cleanup(user_id, exam_ids):
+    db.session.rollback()
+    db.session.execute(text("DELETE FROM Registrations WHERE user_id = :sid"), {"sid": user_id})
+    for exam_id in exam_ids:
+        db.session.execute(text("DELETE FROM Exams WHERE id = :eid"), {"eid": exam_id})
+    db.session.execute(text("DELETE FROM Users WHERE id = :sid"), {"sid": user_id})
+    db.session.commit()
+
+
+def measure(app, history):
+    """Render the appointments page once; returns (statements, seconds)."""
+    from project.student_ui import student_appointments
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        user_id, exam_ids = _seed_student(history)
+        try:
+            with app.test_request_context("/student/appointments"):
+                login_user(db.session.get(User, user_id))
+                event.listen(db.engine, "before_cursor_execute", count)
+                try:
+                    started = time.perf_counter()
+                    student_appointments()
+                    elapsed = time.perf_counter() - started
+                finally:
+                    event.remove(db.engine, "before_cursor_execute", count)
+        finally:
+            _cleanup(user_id, exam_ids)
+    return len(statements), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 40, 200])
+    args = parser.parse_args()
+
+    app = create_app()
+    results = []
+    for size in args.sizes:
+        count, elapsed = measure(app, size)
+        results.append(count)
+        print(f"history={size:>5}  statements={count:>3}  render={elapsed * 1000:7.1f} ms")
+
+    if len(set(results)) != 1:
+        print("FAIL: statement count depends on history size", file=sys.stderr)
+        return 1
+    print(f"OK: {results[0]} statement(s) per page view")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
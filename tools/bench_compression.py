@@ -0,0 +1,104 @@
+"""CPU vs bytes trade-off of response compression on representative pages.
+
+Renders the exam listing, appointments, print log and availability JSON as
+the busiest student in the database (the same pick as tools/bench_queries.py),
+with the compression layer off, then compresses each body at every gzip level
+in --gzip-levels and, when the brotli package is installed, every quality in
+--br-qualities. Reports compressed size, ratio and median CPU time per body:
+
+    python tools/bench_compression.py --repeat 20 --out bench_compression.json
+
+Pick COMPRESSION_LEVEL / COMPRESSION_BR_QUALITY from where the ratio stops
+improving much faster than the CPU time grows.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_login import login_user
+
+# (label, endpoint, path)
+PAGES = [
+    ("exam_listing", "student_ui.student_exams", "/student/exams"),
+    ("appointments", "student_ui.student_appointments", "/student/appointments"),
+    ("print_log", "faculty_ui.faculty_print_log", "/faculty/print_log"),
+    ("availability_json", "student_ui.api_exam_availability", "/api/exams/availability"),
+]
+
+
+def render_bodies(app, db, user_id):
+    from project.models import User
+
+    bodies = {}
+    for label, endpoint, path in PAGES:
+        with app.test_request_context(path):
+            login_user(db.session.get(User, user_id))
+            resp = app.make_response(app.view_functions[endpoint]())
+            bodies[label] = resp.get_data()
+    return bodies
+
+
+def time_compress(fn, body, repeat):
+    samples, out = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(body)
+        samples.append((time.perf_counter() - started) * 1000)
+    return len(out), statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--gzip-levels", default="1,4,6,9")
+    parser.add_argument("--br-qualities", default="1,4,6,11")
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    # measure the raw bodies; the benchmark does its own compressing
+    os.environ["COMPRESSION"] = "0"
+    os.environ["AVAILABILITY_CACHE_TTL"] = "0"
+
+    from project import create_app, db
+    from project.compression import brotli, compress
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    import bench_queries
+
+    app = create_app()
+    with app.app_context():
+        values = bench_queries.sample_values(db)
+    bodies = render_bodies(app, db, values["user_id"])
+
+    settings = [("gzip", int(lvl)) for lvl in args.gzip_levels.split(",")]
+    if brotli is not None:
+        settings += [("br", int(q)) for q in args.br_qualities.split(",")]
+    else:
+        print("brotli not installed; gzip only")
+
+    report = {}
+    for label, body in bodies.items():
+        print(f"{label}: {len(body)} bytes")
+        report[label] = {"bytes": len(body), "results": []}
+        for encoding, level in settings:
+            size, cpu_ms = time_compress(
+                lambda b: compress(b, encoding, level, level), body, args.repeat)
+            ratio = round(100 * size / len(body), 1) if body else None
+            report[label]["results"].append({"encoding": encoding, "level": level,
+                                             "bytes": size, "ratio_pct": ratio,
+                                             "cpu_ms": round(cpu_ms, 3)})
+            print(f"  {encoding:<4} {level:>2}  {size:>9} bytes  {ratio:>5}%  {cpu_ms:>8.3f} ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Query benchmark for the hot routes, optionally across dataset scale points.
+
+For each hot route (exam listing, appointments, availability, print log,
+search, login lookup) the route's view function runs --repeat times inside a
+request context as a logged-in student. Per route it reports statement count
+and the p50/max of time spent in SQL, plus wall time including rendering.
+
+With --scales the synthetic dataset (tools/gen_semester_data.py) is purged
+and regenerated at each scale point before measuring, which shows where a
+query stops scaling:
+
+    python tools/bench_queries.py --scales 10000/500/50000,100000/5000/500000 \
+        --out bench_queries.json
+
+Without --scales it measures whatever data is already in the database.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_login import login_user
+from sqlalchemy import event, text
+
+# (label, endpoint, path, method, form data)
+ROUTES = [
+    ("exam_listing", "student_ui.student_exams", "/student/exams", "GET", None),
+    ("appointments", "student_ui.student_appointments", "/student/appointments", "GET", None),
+    ("availability", "student_ui.api_exam_availability", "/api/exams/availability", "GET", None),
+    ("print_log", "faculty_ui.faculty_print_log", "/faculty/print_log", "GET", None),
+    ("print_log_by_course", "faculty_ui.faculty_print_log",
+     "/faculty/print_log?course={course_code}", "GET", None),
+    ("search_name", "faculty_ui.faculty_search_appointments",
+     "/faculty/search_appointments?q={student_last}", "GET", None),
+    ("search_code", "faculty_ui.faculty_search_appointments",
+     "/faculty/search_appointments?q={confirmation_code}", "GET", None),
+    ("login_lookup", "auth.login", "/login", "POST",
+     {"email": "{student_email}", "password": "not-the-password"}),
+]
+
+
+class SqlTimer:
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        self.seconds += time.perf_counter() - conn.info["bench_started"].pop()
+        self.statements += 1
+
+
+def sample_values(db):
+    """Pick the busiest student and a representative code/course to query for."""
+    row = db.session.execute(text("""
+        SELECT r.user_id, COUNT(*) AS n
+        FROM Registrations r
+        GROUP BY r.user_id
+        ORDER BY n DESC
+        LIMIT 1
+    """)).first()
+    if row is None:
+        raise SystemExit("no registrations in the database; generate some first")
+    student = db.session.execute(text("""
+        SELECT u.id, u.email, u.name,
+               (SELECT r.registration_id FROM Registrations r
+                 WHERE r.user_id = u.id ORDER BY r.id DESC LIMIT 1) AS code,
+               (SELECT c.course_code FROM Registrations r
+                  JOIN Exams e ON e.id = r.exam_id JOIN Courses c ON c.id = e.course_id
+                 WHERE r.user_id = u.id LIMIT 1) AS course_code
+        FROM Users u WHERE u.id = :uid
+    """), {"uid": row.user_id}).first()
+    db.session.rollback()
+    return {
+        "user_id": student.id,
+        "student_email": student.email,
+        "student_last": student.name.split()[-1],
+        "confirmation_code": student.code,
+        "course_code": student.course_code,
+        "history": row.n,
+    }
+
+
+def measure_route(app, db, user, endpoint, path, method, data, repeat):
+    from project.models import User
+
+    view = app.view_functions[endpoint]
+    runs = []
+    for _ in range(repeat):
+        timer = SqlTimer()
+        with app.test_request_context(path, method=method, data=data):
+            if method == "GET":
+                login_user(db.session.get(User, user))
+            event.listen(db.engine, "before_cursor_execute", timer.before)
+            event.listen(db.engine, "after_cursor_execute", timer.after)
+            try:
+                started = time.perf_counter()
+                resp = view()
+                if hasattr(resp, "get_data"):
+                    resp.get_data()  # drain streamed bodies
+                wall = time.perf_counter() - started
+            finally:
+                event.remove(db.engine, "before_cursor_execute", timer.before)
+                event.remove(db.engine, "after_cursor_execute", timer.after)
+        runs.append((timer.statements, timer.seconds * 1000, wall * 1000))
+    sql_ms = [r[1] for r in runs]
+    return {
+        "statements": max(r[0] for r in runs),
+        "sql_p50_ms": round(statistics.median(sql_ms), 2),
+        "sql_max_ms": round(max(sql_ms), 2),
+        "wall_p50_ms": round(statistics.median(r[2] for r in runs), 2),
+    }
+
+
+def bench(app, db, repeat):
+    with app.app_context():
+        values = sample_values(db)
+        counts = {t: db.session.execute(text(f"SELECT COUNT(*) FROM {t}")).scalar()
+                  for t in ("Users", "Exams", "Registrations")}
+        db.session.rollback()
+    results = {}
+    for label, endpoint, path, method, data in ROUTES:
+        path = path.format(**values)
+        data = {k: v.format(**values) for k, v in data.items()} if data else None
+        results[label] = measure_route(app, db, values["user_id"], endpoint, path, method,
+                                       data, repeat)
+        r = results[label]
+        print(f"  {label:<20} stmts={r['statements']:>3}  sql p50={r['sql_p50_ms']:>9.2f} ms"
+              f"  max={r['sql_max_ms']:>9.2f} ms  wall p50={r['wall_p50_ms']:>9.2f} ms")
+    return {"rows": counts, "busiest_student_history": values["history"], "routes": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", help="comma-separated students/sessions/registrations points")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    # every availability call should hit the database, not the response cache
+    os.environ["AVAILABILITY_CACHE_TTL"] = "0"
+
+    from project import create_app, db
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    import gen_semester_data
+
+    app = create_app()
+    report = []
+    points = [p.split("/") for p in args.scales.split(",")] if args.scales else [None]
+    for point in points:
+        if point:
+            students, sessions, registrations = (int(x) for x in point)
+            print(f"scale: {students} students / {sessions} sessions / {registrations} registrations")
+            with app.app_context():
+                gen_semester_data.purge(db, echo=lambda *_: None)
+                gen_semester_data.generate(db, students, sessions, registrations,
+                                           seed=args.seed, echo=lambda *_: None)
+        else:
+            print("scale: current database")
+        entry = bench(app, db, args.repeat)
+        entry["scale"] = "/".join(point) if point else "current"
+        report.append(entry)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Cold-start benchmark for ``create_app()``.
+
+Each run is a fresh interpreter that imports the package and builds the app,
+so import cost is included just as it is for a new gunicorn worker. Reports
+the median of --repeat runs for the import, each create_app phase (see
+project/startup.py) and the total:
+
+    python tools/bench_startup.py --repeat 10
+    APP_ENV=production python tools/bench_startup.py --history bench_startup.jsonl
+
+With --history the medians are appended as one JSON line tagged with the git
+revision, and the change against the previous line is printed, so startup
+time can be tracked from commit to commit.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Runs in the child: time the import separately from create_app itself.
+_CHILD = """
+import json, time
+started = time.perf_counter()
+import project
+imported = time.perf_counter()
+app = project.create_app()
+done = time.perf_counter()
+print(json.dumps({"import": (imported - started) * 1000,
+                  "phases": app.extensions["startup_ms"],
+                  "cold_start": (done - started) * 1000}))
+"""
+
+
+def run_once(env):
+    out = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    sample = json.loads(out.strip().splitlines()[-1])
+    timings = {"import": sample["import"]}
+    timings.update({f"create_app.{k}": v for k, v in sample["phases"].items()})
+    timings["cold_start"] = sample["cold_start"]
+    return timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def last_entry(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        lines = [ln for ln in f if ln.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=0,
+                        help="connections to open during create_app (DB_POOL_WARMUP)")
+    parser.add_argument("--history", help="append the medians to this JSON-lines file")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DB_POOL_WARMUP=str(args.warmup))
+    runs = [run_once(env) for _ in range(args.repeat)]
+    medians = {k: round(statistics.median(r[k] for r in runs), 2) for k in runs[0]}
+
+    previous = last_entry(args.history) if args.history else None
+    for key, value in medians.items():
+        line = f"  {key:<24} {value:>9.2f} ms"
+        if previous and key in previous["median_ms"]:
+            line += f"  ({value - previous['median_ms'][key]:+.2f} vs {previous['revision']})"
+        print(line)
+
+    if args.history:
+        entry = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "app_env": os.getenv("APP_ENV", "development"),
+            "repeat": args.repeat,
+            "median_ms": medians,
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
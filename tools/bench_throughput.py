@@ -0,0 +1,146 @@
+"""Throughput benchmark: the old dev-server launcher vs gunicorn.
+
+Starts each server in turn on its own port, waits for ``/__alive``, then
+drives --paths from --clients threads for --seconds and reports requests per
+second, p50/p95/p99 latency and error count per server:
+
+    python tools/bench_throughput.py --clients 64 --seconds 20 \
+        --paths /__alive,/,/login --out bench_throughput.json
+
+``dev`` is the previous launcher (``app.run(debug=True)``: one process, the
+reloader and the debugger); ``gunicorn`` is ``gunicorn -c gunicorn.conf.py
+wsgi:app`` with its env-driven worker/thread sizing. Pick servers with
+--servers.
+
+Both children run with ``APP_ENV=development`` (override with --app-env), so
+each reads .env the same way; gunicorn.conf.py would otherwise default to
+production mode, which ignores .env and refuses to start without
+CONFIRMATION_CODE_KEY. To measure production mode, pass --app-env production
+with the real settings exported in the environment.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SERVERS = {
+    "dev": lambda port: [sys.executable, "-c",
+                         f"from run import app; app.run(debug=True, host='127.0.0.1', port={port})"],
+    "gunicorn": lambda port: [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                              "--bind", f"127.0.0.1:{port}", "wsgi:app"],
+}
+
+
+def wait_until_up(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/__alive")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"server on port {port} did not come up")
+
+
+def drive(port, paths, clients, seconds):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def client(offset):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, failed, i = [], 0, offset
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 500:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            mine.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)], 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def bench_server(name, port, args):
+    env = dict(os.environ, APP_ENV=args.app_env)
+    proc = subprocess.Popen(SERVERS[name](port), cwd=ROOT, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(port)
+        return drive(port, args.paths.split(","), args.clients, args.seconds)
+    finally:
+        # the dev server's reloader runs the app in a child; stop the whole group
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", default="dev,gunicorn")
+    parser.add_argument("--paths", default="/__alive,/,/login")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--app-env", default="development",
+                        help="APP_ENV for both servers (default: development, reads .env)")
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = {}
+    for n, name in enumerate(args.servers.split(",")):
+        r = report[name] = bench_server(name, args.port + n, args)
+        print(f"  {name:<9} {r['rps']:>8.1f} req/s  p50={r['p50_ms']} ms  p95={r['p95_ms']} ms"
+              f"  p99={r['p99_ms']} ms  errors={r['errors']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"clients": args.clients, "seconds": args.seconds,
+                       "paths": args.paths.split(","), "servers": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
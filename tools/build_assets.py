@@ -0,0 +1,133 @@
+"""Build fingerprinted, precompressed static assets into project/static/dist.
+
+For every file under project/static (except dist/ itself):
+
+* copy it to ``dist/<dir>/<name>.<hash><ext>``, the hash being the first 12
+  hex digits of its SHA-256, so the URL changes whenever the content does;
+* for text assets (css, js, svg) also write ``.gz`` and, when the optional
+  ``brotli`` package is installed, ``.br`` variants, kept only if smaller;
+* for the logos in IMAGE_BOXES also write a WebP resized to fit its box
+  (twice the largest size the CSS shows it at); needs Pillow.
+
+``dist/manifest.json`` maps each original path to its built names; the app
+(project/assets.py) reads it at startup so ``url_for('static', ...)`` hands
+out hashed URLs. Run it as part of every deploy:
+
+    python tools/build_assets.py
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STATIC = os.path.join(ROOT, "project", "static")
+DIST = os.path.join(STATIC, "dist")
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt"}
+
+# (max width, max height) in pixels for the WebP copy of each image
+IMAGE_BOXES = {
+    "images/header-logo.png": (400, 80),    # .header-logo{height:40px}
+    "images/logo-large.png": (720, 720),    # login card, ~360px wide
+    "images/csnlogo.png": (800, 400),       # home page, 400x200
+}
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def hashed_name(rel: str, digest: str, ext=None) -> str:
+    stem, orig_ext = os.path.splitext(rel)
+    return f"{stem}.{digest}{ext or orig_ext}"
+
+
+def write(rel_out: str, data: bytes) -> None:
+    path = os.path.join(DIST, rel_out)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def compress_variants(rel_out: str, data: bytes, brotli):
+    """Write .gz / .br next to ``rel_out`` when they are smaller; returns the encodings kept."""
+    kept = []
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        write(rel_out + ".gz", gz)
+        kept.append("gzip")
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            write(rel_out + ".br", br)
+            kept.append("br")
+    return kept
+
+
+def webp_variant(src_path: str, box, image_mod):
+    from io import BytesIO
+
+    with image_mod.open(src_path) as img:
+        img.thumbnail(box)
+        out = BytesIO()
+        img.save(out, "WEBP", quality=82, method=6)
+        return out.getvalue()
+
+
+def build(echo=print):
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        echo("brotli not installed; writing gzip variants only")
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+        echo("Pillow not installed; skipping WebP variants")
+
+    if os.path.isdir(DIST):
+        shutil.rmtree(DIST)
+    manifest = {"files": {}, "encodings": {}, "webp": {}}
+
+    for dirpath, dirnames, filenames in os.walk(STATIC):
+        dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != DIST]
+        for filename in sorted(filenames):
+            src = os.path.join(dirpath, filename)
+            rel = os.path.relpath(src, STATIC).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            out = hashed_name(rel, fingerprint(data))
+            write(out, data)
+            manifest["files"][rel] = "dist/" + out
+
+            if os.path.splitext(rel)[1].lower() in COMPRESSIBLE and data:
+                kept = compress_variants(out, data, brotli)
+                if kept:
+                    manifest["encodings"]["dist/" + out] = kept
+
+            if rel in IMAGE_BOXES and Image is not None:
+                webp = webp_variant(src, IMAGE_BOXES[rel], Image)
+                webp_out = hashed_name(rel, fingerprint(webp), ".webp")
+                write(webp_out, webp)
+                manifest["webp"][rel] = "dist/" + webp_out
+                echo(f"  {rel}: {len(data)} -> {len(webp)} bytes as WebP")
+
+    with open(os.path.join(DIST, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    echo(f"Built {len(manifest['files'])} asset(s) into {os.path.relpath(DIST, ROOT)}")
+    return manifest
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    build()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
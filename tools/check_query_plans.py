@@ -0,0 +1,79 @@
+"""EXPLAIN-based check that the hot queries use an index.
+
+Runs EXPLAIN for each hot query against the database configured in .env and
+fails if MySQL plans a full table scan (``type = ALL``) on Registrations or
+Exams. The statements come from the routes' own module-level SQL and query
+builders (student_ui, faculty_ui), so the check follows the code: booking
+limit/duplicate check, exam listing, availability, the keyset-paged
+appointments page and the print log page and export.
+
+Run it after `flask schema upgrade`, on a dataset of realistic size: on a
+handful of seed rows the optimizer may prefer a scan no matter what.
+
+    python tools/check_query_plans.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from project import create_app, db
+
+WATCHED_TABLES = {"Registrations", "Exams"}
+
+# keyset positions that select every row, so the cursor predicate is planned
+_APPOINTMENTS_AFTER = ("2999-12-31", "23:59:59", 2 ** 31)
+_PRINT_LOG_AFTER = ("1970-01-01", "00:00:00", 0)
+_DATE_RANGE = {"start": "2025-01-01", "end": "2025-12-31", "location_id": None, "course": ""}
+_NO_FILTERS = {"start": "", "end": "", "location_id": None, "course": ""}
+
+
+def hot_queries():
+    """(label, statement, params) for the hot paths, built by the routes' own code."""
+    from project.faculty_ui import PRINT_LOG_PAGE_SIZE, print_log_sql
+    from project.student_ui import (ACTIVE_BOOKINGS_SQL, AVAILABILITY_SQL, UPCOMING_EXAMS_SQL,
+                                    appointments_sql)
+
+    return [
+        ("booking_limit_and_duplicate", ACTIVE_BOOKINGS_SQL, {"sid": 1, "eid": 1}),
+        ("upcoming_exams", UPCOMING_EXAMS_SQL, {}),
+        ("availability", AVAILABILITY_SQL, {}),
+        ("appointments_first_page", *appointments_sql(1)),
+        ("appointments_next_page", *appointments_sql(1, position=_APPOINTMENTS_AFTER)),
+        ("print_log_first_page", *print_log_sql(_NO_FILTERS, limit=PRINT_LOG_PAGE_SIZE + 1)),
+        ("print_log_next_page", *print_log_sql(_NO_FILTERS, _PRINT_LOG_AFTER,
+                                               PRINT_LOG_PAGE_SIZE + 1)),
+        ("print_log_export", *print_log_sql(_DATE_RANGE)),
+    ]
+
+
+def full_scans(label, sql, params):
+    """Return the EXPLAIN rows for this query that scan a watched table."""
+    sql = getattr(sql, "text", sql)  # route builders hand back text() clauses
+    rows = db.session.execute(text("EXPLAIN " + sql), params).mappings().all()
+    bad = []
+    for row in rows:
+        table = row.get("table") or ""
+        aliased = {"r": "Registrations", "e": "Exams"}.get(table, table)
+        if aliased in WATCHED_TABLES and row.get("type") == "ALL":
+            bad.append(f"{label}: full scan of {aliased} (possible_keys={row.get('possible_keys')})")
+    return bad
+
+
+def main():
+    app = create_app()
+    failures = []
+    with app.app_context():
+        for label, sql, params in hot_queries():
+            problems = full_scans(label, sql, params)
+            print(f"{'FAIL' if problems else ' ok '}  {label}")
+            failures.extend(problems)
+    for line in failures:
+        print(line, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Check read-replica routing locally with two SQLite files standing in for
+the primary and the replica.
+
+    python tools/check_replica_routing.py
+
+Each database gets a one-row ``whoami`` table naming itself; the script then
+asserts that read_execute() reads the replica, and falls back to the primary
+inside the read-your-writes window after mark_recent_write().
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text
+
+
+def main():
+    tmp = tempfile.mkdtemp(prefix="replica-check-")
+    urls = {
+        "primary": f"sqlite:///{os.path.join(tmp, 'primary.sqlite3')}",
+        "replica": f"sqlite:///{os.path.join(tmp, 'replica.sqlite3')}",
+    }
+    for name, url in urls.items():
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE whoami (name TEXT)"))
+            conn.execute(text("INSERT INTO whoami VALUES (:n)"), {"n": name})
+        engine.dispose()
+
+    os.environ["DATABASE_URL"] = urls["primary"]
+    os.environ["REPLICA_DATABASE_URL"] = urls["replica"]
+    os.environ["DB_POOL_WARMUP"] = "0"
+
+    from project import create_app
+    from project.db_routing import mark_recent_write, read_execute
+
+    app = create_app()
+    whoami = text("SELECT name FROM whoami")
+    with app.test_request_context("/"):
+        first = read_execute(whoami).scalar()
+        mark_recent_write()
+        sticky = read_execute(whoami).scalar()
+
+    print(f"read_execute -> {first}; after mark_recent_write -> {sticky}")
+    assert first == "replica", first
+    assert sticky == "primary", sticky
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
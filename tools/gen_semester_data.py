@@ -0,0 +1,247 @@
+"""Synthetic semester dataset generator.
+
+Fills the existing schema (Departments, Majors, Users, Courses, Locations,
+Buildings, Exams, Registrations) at a configurable scale with realistic skew:
+
+* exam popularity follows a Zipf curve (a few sessions are hammered, most
+  are quiet) and exam dates bunch around midterm and finals weeks;
+* students are skewed too (some book a lot, most a little), never with more
+  than 3 active bookings;
+* ~15% of registrations are cancelled by choice, and draws that would
+  overfill a session or give a student a 4th active booking are stored as
+  cancelled history, so the seat and per-student invariants always hold.
+
+Everything it creates is tagged ("Synthetic ..." names, SYN course codes) so
+--purge can remove it again. Confirmation codes come from the app's own
+allocator, so generated codes never collide with real ones. Booked-seat
+counters are reconciled at the end.
+
+    python tools/gen_semester_data.py --students 100000 --sessions 5000 \
+        --registrations 500000
+    python tools/gen_semester_data.py --purge
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+
+MAX_ACTIVE = 3
+TAG = "Synthetic"
+
+
+def _insert(db, sql, rows, batch):
+    stmt = text(sql)
+    for i in range(0, len(rows), batch):
+        db.session.execute(stmt, rows[i:i + batch])
+        db.session.commit()
+
+
+def _ids(db, sql, **params):
+    return [r[0] for r in db.session.execute(text(sql), params)]
+
+
+def zipf_cum_weights(n, s=1.1):
+    """Cumulative Zipf weights (for random.choices(cum_weights=...), O(log n) per draw)."""
+    total, cum = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1.0 / (rank ** s)
+        cum.append(total)
+    return cum
+
+
+def exam_dates(n, start):
+    """Dates over a 16-week term, bunched around week 8 (midterms) and 16 (finals)."""
+    dates = []
+    for _ in range(n):
+        roll = random.random()
+        if roll < 0.35:
+            week = random.gauss(8, 0.8)
+        elif roll < 0.7:
+            week = random.gauss(15.5, 0.6)
+        else:
+            week = random.uniform(1, 16)
+        dates.append(start + datetime.timedelta(days=max(0, min(int(week * 7), 16 * 7))))
+    return dates
+
+
+def generate(db, students, sessions, registrations, batch=5000, seed=None, echo=print):
+    """Insert one synthetic semester; returns a dict of row counts."""
+    from project.confirmation_codes import code_allocator, format_code, permute
+    from project.seat_counter import reconcile_booked_counts
+    from flask import current_app
+
+    rnd_seed = seed if seed is not None else random.randrange(1 << 30)
+    random.seed(rnd_seed)
+    run = f"{rnd_seed % 1000:03d}"
+    started = time.perf_counter()
+
+    # --- reference data -------------------------------------------------
+    n_depts = max(3, students // 10000)
+    _insert(db, "INSERT INTO Departments (name) VALUES (:name)",
+            [{"name": f"{TAG} Department {run}-{i}"} for i in range(n_depts)], batch)
+    dept_ids = _ids(db, "SELECT id FROM Departments WHERE name LIKE :p", p=f"{TAG} Department {run}-%")
+
+    _insert(db, "INSERT INTO Majors (name, department_id) VALUES (:name, :dept)",
+            [{"name": f"{TAG} Major {run}-{i}", "dept": random.choice(dept_ids)}
+             for i in range(n_depts * 5)], batch)
+    major_rows = db.session.execute(text("""
+        SELECT id, department_id FROM Majors WHERE name LIKE :p
+    """), {"p": f"{TAG} Major {run}-%"}).all()
+
+    n_courses = max(10, sessions // 15)
+    _insert(db, """
+        INSERT INTO Courses (course_code, course_name, department_id)
+        VALUES (:code, :name, :dept)
+    """, [{"code": f"SYN{run}{i:04d}", "name": f"{TAG} Course {i}", "dept": random.choice(dept_ids)}
+          for i in range(n_courses)], batch)
+    course_ids = _ids(db, "SELECT id FROM Courses WHERE course_code LIKE :p", p=f"SYN{run}%")
+
+    _insert(db, "INSERT INTO Locations (name) VALUES (:name)",
+            [{"name": f"{TAG} Campus {run}-{i}"} for i in range(3)], batch)
+    loc_ids = _ids(db, "SELECT id FROM Locations WHERE name LIKE :p", p=f"{TAG} Campus {run}-%")
+    _insert(db, "INSERT INTO Buildings (name, location_id) VALUES (:name, :loc)",
+            [{"name": f"{TAG} Building {run}-{i}", "loc": loc} for loc in loc_ids for i in range(4)],
+            batch)
+    buildings = db.session.execute(text("""
+        SELECT id, location_id FROM Buildings WHERE name LIKE :p
+    """), {"p": f"{TAG} Building {run}-%"}).all()
+    echo(f"reference data: {n_depts} departments, {len(course_ids)} courses, "
+         f"{len(buildings)} buildings")
+
+    # --- students --------------------------------------------------------
+    role_id = db.session.execute(text("""
+        SELECT id FROM Roles WHERE LOWER(name) = 'student' LIMIT 1
+    """)).scalar()
+    pw_hash = generate_password_hash("synthetic", method="pbkdf2:sha256:1")
+    user_rows = []
+    for i in range(students):
+        nshe = f"7{run}{i:06d}"
+        major = random.choice(major_rows)
+        user_rows.append({"name": f"{TAG} Student {i}", "email": f"{nshe}@student.csn.edu",
+                          "nshe": nshe, "hash": pw_hash, "role": role_id,
+                          "major": major.id, "dept": major.department_id})
+    _insert(db, """
+        INSERT INTO Users (name, email, phone, nshe_id, password_hash, role_id, major_id, department_id)
+        VALUES (:name, :email, '000-000-0000', :nshe, :hash, :role, :major, :dept)
+    """, user_rows, batch)
+    user_ids = _ids(db, "SELECT id FROM Users WHERE nshe_id LIKE :p", p=f"7{run}%")
+    echo(f"students: {len(user_ids)}")
+
+    # --- exam sessions ---------------------------------------------------
+    term_start = datetime.date.today() - datetime.timedelta(weeks=8)
+    exam_rows = []
+    for d in exam_dates(sessions, term_start):
+        bld = random.choice(buildings)
+        exam_rows.append({"type": f"{TAG} {random.choice(['Midterm', 'Final', 'Quiz', 'Exam #1'])}",
+                          "course": random.choice(course_ids), "date": d,
+                          "time": datetime.time(random.choice([8, 9, 10, 13, 15, 17]), 0),
+                          "loc": bld.location_id, "bld": bld.id,
+                          "cap": random.choice([20, 20, 20, 30, 40])})
+    _insert(db, """
+        INSERT INTO Exams (exam_type, course_id, exam_date, exam_time, location_id, building_id, capacity)
+        VALUES (:type, :course, :date, :time, :loc, :bld, :cap)
+    """, exam_rows, batch)
+    exams = db.session.execute(text("""
+        SELECT e.id, e.capacity FROM Exams e
+        JOIN Courses c ON c.id = e.course_id
+        WHERE c.course_code LIKE :p
+    """), {"p": f"SYN{run}%"}).all()
+    echo(f"exam sessions: {len(exams)}")
+
+    # --- registrations ---------------------------------------------------
+    exam_ids = [e.id for e in exams]
+    random.shuffle(exam_ids)
+    exam_cum = zipf_cum_weights(len(exam_ids))
+    cap = {e.id: e.capacity for e in exams}
+    active_per_exam = dict.fromkeys(exam_ids, 0)
+    active_per_user = dict.fromkeys(user_ids, 0)
+    taken = set()
+    user_cum = zipf_cum_weights(len(user_ids), s=0.6)
+
+    start_seq, _ = code_allocator.reserve_block(registrations)
+    key = current_app.config["CONFIRMATION_CODE_KEY"].encode()
+    reg_rows = []
+    attempts = 0
+    while len(reg_rows) < registrations and attempts < registrations * 5:
+        attempts += 1
+        exam_id = random.choices(exam_ids, cum_weights=exam_cum)[0]
+        user_id = random.choices(user_ids, cum_weights=user_cum)[0]
+        if (exam_id, user_id) in taken:
+            continue
+        status = "Canceled" if random.random() < 0.15 else "Active"
+        if status == "Active" and (active_per_user[user_id] >= MAX_ACTIVE
+                                   or active_per_exam[exam_id] >= cap[exam_id]):
+            status = "Canceled"
+        if status == "Active":
+            active_per_user[user_id] += 1
+            active_per_exam[exam_id] += 1
+        taken.add((exam_id, user_id))
+        reg_rows.append({"code": format_code(permute(start_seq + len(reg_rows), key)),
+                         "exam": exam_id, "user": user_id, "status": status})
+    _insert(db, """
+        INSERT INTO Registrations (registration_id, exam_id, user_id, status)
+        VALUES (:code, :exam, :user, :status)
+    """, reg_rows, batch)
+    echo(f"registrations: {len(reg_rows)}")
+
+    reconcile_booked_counts()
+    return {"seed": rnd_seed, "students": len(user_ids), "sessions": len(exams),
+            "registrations": len(reg_rows), "seconds": round(time.perf_counter() - started, 1)}
+
+
+def purge(db, echo=print):
+    """Delete every row this generator created."""
+    statements = [
+        ("registrations", """
+            DELETE r FROM Registrations r JOIN Users u ON u.id = r.user_id
+            WHERE u.name LIKE 'Synthetic Student %'"""),
+        ("registrations", """
+            DELETE r FROM Registrations r JOIN Exams e ON e.id = r.exam_id
+            WHERE e.exam_type LIKE 'Synthetic %'"""),
+        ("exams", "DELETE FROM Exams WHERE exam_type LIKE 'Synthetic %'"),
+        ("users", "DELETE FROM Users WHERE name LIKE 'Synthetic Student %'"),
+        ("courses", "DELETE FROM Courses WHERE course_code LIKE 'SYN%'"),
+        ("buildings", "DELETE FROM Buildings WHERE name LIKE 'Synthetic Building %'"),
+        ("locations", "DELETE FROM Locations WHERE name LIKE 'Synthetic Campus %'"),
+        ("majors", "DELETE FROM Majors WHERE name LIKE 'Synthetic Major %'"),
+        ("departments", "DELETE FROM Departments WHERE name LIKE 'Synthetic Department %'"),
+    ]
+    for label, sql in statements:
+        n = db.session.execute(text(sql)).rowcount
+        db.session.commit()
+        echo(f"purged {n} {label}")
+    from project.seat_counter import reconcile_booked_counts
+    reconcile_booked_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--registrations", type=int, default=500000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--purge", action="store_true", help="delete generated rows and exit")
+    args = parser.parse_args()
+
+    from project import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        if args.purge:
+            purge(db)
+            return 0
+        print(generate(db, args.students, args.sessions, args.registrations,
+                       batch=args.batch, seed=args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""Concurrent booking load test: many students, few seats, same minute.
+
+Builds the app with create_app() against the database configured in .env,
+seeds throwaway students and exam sessions, and drives the JSON booking
+endpoints from a thread pool (one logged-in test client per student):
+
+1. burst  - every student tries to book the hot session at once
+            (the 9:00 AM scenario: --students against --capacity seats);
+2. mix    - --ops further requests drawn from --mix (register / cancel /
+            reschedule) across all seeded sessions.
+
+It reports throughput, p50/p95/p99 latency and status codes per operation,
+plus any deadlock/retry counters the app published on /__metrics. It then
+checks the invariants: active registrations per exam never exceed capacity,
+and no student holds more than 3. Results are written as JSON (--out) so
+runs can be compared across commits. Exits 1 if an invariant is broken.
+
+    python tools/loadtest_booking.py --students 2000 --capacity 20 --threads 64 \
+        --out loadtest.json
+
+Threads share one process (the GIL caps CPU-bound throughput); run several
+copies side by side to push harder. Seeded rows are deleted afterwards
+unless --keep is given.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import bindparam, text
+from werkzeug.security import generate_password_hash
+
+MAX_ACTIVE = 3
+
+
+def parse_mix(raw):
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - {"register", "cancel", "reschedule"}
+    if unknown:
+        raise SystemExit(f"unknown operation(s) in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[idx] * 1000, 2)
+
+
+# ---------------------------------------------------------------- seeding
+
+def seed(db, students, sessions, capacity):
+    """Insert bench exams and students; returns (exam_ids, [(user_id, email, password)])."""
+    ref = db.session.execute(text("""
+        SELECT (SELECT id FROM Courses ORDER BY id LIMIT 1)   AS course_id,
+               (SELECT id FROM Locations ORDER BY id LIMIT 1) AS location_id,
+               (SELECT id FROM Buildings ORDER BY id LIMIT 1) AS building_id,
+               (SELECT id FROM Roles WHERE LOWER(name) = 'student' LIMIT 1) AS role_id
+    """)).first()
+
+    exam_ids = []
+    for i in range(sessions):
+        exam_ids.append(db.session.execute(text("""
+            INSERT INTO Exams (exam_type, course_id, exam_date, exam_time,
+                               location_id, building_id, capacity)
+            VALUES ('Load Test', :course, DATE_ADD(CURDATE(), INTERVAL 7 DAY),
+                    MAKETIME(9 + :i, 0, 0), :loc, :bld, :cap)
+        """), {"course": ref.course_id, "i": i, "loc": ref.location_id,
+               "bld": ref.building_id, "cap": capacity}).lastrowid)
+
+    # One cheap hash for every synthetic student: logins stay fast and real.
+    run = random.randint(100, 999)
+    password = "loadtest"
+    pw_hash = generate_password_hash(password, method="pbkdf2:sha256:1")
+    rows = [{"name": f"Load Student {i}", "email": f"8{run}{i:06d}@student.csn.edu",
+             "nshe": f"8{run}{i:06d}", "hash": pw_hash, "role": ref.role_id}
+            for i in range(students)]
+    db.session.execute(text("""
+        INSERT INTO Users (name, email, phone, nshe_id, password_hash, role_id)
+        VALUES (:name, :email, '000-000-0000', :nshe, :hash, :role)
+    """), rows)
+    db.session.commit()
+
+    users = db.session.execute(text("""
+        SELECT id, email FROM Users WHERE email IN :emails
+    """).bindparams(bindparam("emails", expanding=True)),
+        {"emails": [r["email"] for r in rows]}).all()
+    return exam_ids, [(u.id, u.email, password) for u in users]
+
+
+def cleanup(db, exam_ids, user_ids):
+    db.session.rollback()
+    users = bindparam("users", expanding=True)
+    exams = bindparam("exams", expanding=True)
+    ids = {"users": list(user_ids), "exams": list(exam_ids)}
+    db.session.execute(text("""
+        DELETE FROM Registrations WHERE user_id IN :users OR exam_id IN :exams
+    """).bindparams(users, exams), ids)
+    db.session.execute(text("DELETE FROM Exams WHERE id IN :exams").bindparams(exams), ids)
+    db.session.execute(text("DELETE FROM Users WHERE id IN :users").bindparams(users), ids)
+    db.session.commit()
+
+
+# ---------------------------------------------------------------- driving
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, op, seconds, status):
+        with self._lock:
+            self.latency[op].append(seconds)
+            self.statuses[op][str(status)] += 1
+
+    def summary(self):
+        out = {}
+        for op, values in self.latency.items():
+            values = sorted(values)
+            out[op] = {
+                "requests": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": round(values[-1] * 1000, 2),
+                "statuses": dict(self.statuses[op]),
+            }
+        return out
+
+
+class Student:
+    def __init__(self, app, user_id, email, password):
+        self.user_id = user_id
+        self.client = app.test_client()
+        resp = self.client.post("/login", data={"email": email, "password": password})
+        if resp.status_code != 302:
+            raise RuntimeError(f"login failed for {email}: {resp.status_code}")
+
+    def timed(self, recorder, op, method, url, **kwargs):
+        started = time.perf_counter()
+        resp = getattr(self.client, method)(url, **kwargs)
+        recorder.add(op, time.perf_counter() - started, resp.status_code)
+        return resp
+
+
+def active_registrations(db, user_ids):
+    rows = db.session.execute(text("""
+        SELECT id, user_id, exam_id FROM Registrations
+        WHERE status = 'Active' AND user_id IN :users
+    """).bindparams(bindparam("users", expanding=True)), {"users": list(user_ids)}).all()
+    db.session.rollback()
+    mine = defaultdict(list)
+    for r in rows:
+        mine[r.user_id].append((r.id, r.exam_id))
+    return mine
+
+
+def run_mix_op(student, op, exam_ids, bookings, recorder):
+    if op == "register":
+        student.timed(recorder, op, "post", "/student/register_exam",
+                      json={"exam_id": random.choice(exam_ids)})
+    elif op == "cancel":
+        if not bookings:
+            return
+        _, exam_id = random.choice(bookings)
+        student.timed(recorder, op, "post", f"/student/cancel_exam/{exam_id}", json={})
+    elif op == "reschedule":
+        if not bookings:
+            return
+        reg_id, exam_id = random.choice(bookings)
+        target = random.choice([e for e in exam_ids if e != exam_id] or exam_ids)
+        student.timed(recorder, op, "post", "/student/reschedule",
+                      json={"registration_id": reg_id, "exam_id": target})
+
+
+def check_invariants(db, exam_ids, user_ids):
+    ids = {"exams": list(exam_ids), "users": list(user_ids)}
+    over_capacity = db.session.execute(text("""
+        SELECT e.id, e.capacity, e.booked_count, COUNT(r.id) AS active
+        FROM Exams e
+        LEFT JOIN Registrations r ON r.exam_id = e.id AND r.status = 'Active'
+        WHERE e.id IN :exams
+        GROUP BY e.id, e.capacity, e.booked_count
+    """).bindparams(bindparam("exams", expanding=True)), {"exams": ids["exams"]}).all()
+    over_limit = db.session.execute(text("""
+        SELECT user_id, COUNT(*) AS active
+        FROM Registrations
+        WHERE status = 'Active' AND user_id IN :users
+        GROUP BY user_id
+        HAVING COUNT(*) > :limit
+    """).bindparams(bindparam("users", expanding=True)),
+        {"users": ids["users"], "limit": MAX_ACTIVE}).all()
+    db.session.rollback()
+    return {
+        "exams": [{"exam_id": r.id, "capacity": r.capacity, "active": r.active,
+                   "booked_count": r.booked_count} for r in over_capacity],
+        "oversold": [r.id for r in over_capacity if r.active > r.capacity],
+        "counter_drift": [r.id for r in over_capacity if r.active != r.booked_count],
+        "over_limit_users": [r.user_id for r in over_limit],
+    }
+
+
+def contention_counters(before, after):
+    """Counters the app bumped for deadlocks, lock timeouts and retries during the run."""
+    keys = [k for k in after if any(w in k for w in ("deadlock", "lock_timeout", "retry"))]
+    return {k: after[k] - before.get(k, 0) for k in sorted(keys)}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=3, help="exam sessions; the first is the hot one")
+    parser.add_argument("--capacity", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--ops", type=int, default=2000, help="requests in the mixed phase")
+    parser.add_argument("--mix", default="register=0.5,cancel=0.25,reschedule=0.25")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", help="write the JSON report here as well as stdout")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+    os.environ.setdefault("DB_POOL_SIZE", str(args.threads))
+
+    from project import create_app, db, metrics
+
+    app = create_app()
+    with app.app_context():
+        exam_ids, users = seed(db, args.students, args.sessions, args.capacity)
+    user_ids = [u[0] for u in users]
+    report = {"commit": git_commit(), "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "config": vars(args)}
+
+    try:
+        with ThreadPoolExecutor(args.threads) as pool:
+            students = list(pool.map(lambda u: Student(app, *u), users))
+
+        recorder = Recorder()
+        counters_before = metrics.snapshot()["counters"]
+
+        # Phase 1: everyone wants the hot session at the same moment
+        hot = exam_ids[0]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda s: s.timed(recorder, "register", "post",
+                                            "/student/register_exam", json={"exam_id": hot}),
+                          students))
+        burst_seconds = time.perf_counter() - started
+
+        # Phase 2: mixed register / cancel / reschedule traffic
+        with app.app_context():
+            bookings = active_registrations(db, user_ids)
+        ops = random.choices(list(mix), weights=list(mix.values()), k=args.ops)
+        plan = [(random.choice(students), op) for op in ops]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda p: run_mix_op(p[0], p[1], exam_ids,
+                                               bookings.get(p[0].user_id, []), recorder),
+                          plan))
+        mix_seconds = time.perf_counter() - started
+
+        counters_after = metrics.snapshot()["counters"]
+        with app.app_context():
+            invariants = check_invariants(db, exam_ids, user_ids)
+
+        total = sum(len(v) for v in recorder.latency.values())
+        report.update({
+            "burst": {"seconds": round(burst_seconds, 3),
+                      "throughput_rps": round(len(students) / burst_seconds, 1)},
+            "mix": {"seconds": round(mix_seconds, 3),
+                    "throughput_rps": round((total - len(students)) / mix_seconds, 1)
+                    if mix_seconds else None},
+            "operations": recorder.summary(),
+            "contention": contention_counters(counters_before, counters_after),
+            "invariants": invariants,
+        })
+    finally:
+        if not args.keep:
+            with app.app_context():
+                cleanup(db, exam_ids, user_ids)
+
+    body = json.dumps(report, indent=2, default=str)
+    print(body)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+
+    broken = report["invariants"]["oversold"] or report["invariants"]["over_limit_users"]
+    if broken:
+        print("FAIL: booking invariants violated", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Worker/thread sizing, recycling and shutdown live in gunicorn.conf.py. Set
+APP_ENV=production in the real environment (see project.create_app).
+"""
+from project import create_app
+
+app = create_app()